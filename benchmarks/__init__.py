@@ -0,0 +1,6 @@
+"""
+Benchmarks for md2gemini. These aren't tests, run them as modules:
+
+    python -m benchmarks.run          Every link mode and option, as JSON
+    python -m benchmarks.paragraphs   Scaling with the number of paragraphs
+"""
@@ -0,0 +1,142 @@
+"""
+Generates synthetic markdown documents for benchmarking.
+"""
+
+import random
+
+WORDS = (
+    "the quick brown fox jumps over lazy dog gemini capsule markdown text link "
+    "server client protocol request response page document table list quote"
+).split()
+
+
+class Corpus:
+    """Settings for generating documents. Each count is per document.
+
+    paragraphs: Number of paragraphs.
+
+    links: Number of links in each paragraph.
+
+    emphasis: Number of emphasized, strong or code spans in each paragraph.
+
+    inline_html: Number of inline HTML tags in each paragraph.
+
+    html_blocks: Number of HTML blocks.
+
+    lists: Number of lists, with list_items items each, nested list_depth levels deep.
+
+    tables: Number of tables, of table_rows rows and table_cols columns.
+
+    code_blocks: Number of fenced code blocks, of code_lines lines.
+
+    quotes: Number of block quotes, with a link in each.
+    """
+
+    def __init__(
+        self,
+        paragraphs=20,
+        links=2,
+        emphasis=3,
+        inline_html=1,
+        html_blocks=1,
+        lists=3,
+        list_items=5,
+        list_depth=2,
+        tables=1,
+        table_rows=10,
+        table_cols=4,
+        code_blocks=2,
+        code_lines=10,
+        quotes=2,
+    ):
+        self.paragraphs = paragraphs
+        self.links = links
+        self.emphasis = emphasis
+        self.inline_html = inline_html
+        self.html_blocks = html_blocks
+        self.lists = lists
+        self.list_items = list_items
+        self.list_depth = list_depth
+        self.tables = tables
+        self.table_rows = table_rows
+        self.table_cols = table_cols
+        self.code_blocks = code_blocks
+        self.code_lines = code_lines
+        self.quotes = quotes
+
+    def settings(self):
+        return dict(self.__dict__)
+
+    def generate(self, seed=0):
+        """Generate one document. The same seed always gives the same document."""
+
+        r = random.Random(seed)
+        blocks = []
+        for _ in range(self.paragraphs):
+            blocks.append(self._paragraph(r))
+        for _ in range(self.html_blocks):
+            blocks.append("<div>\n<p>" + self._words(r, 8) + "</p>\n</div>")
+        for _ in range(self.lists):
+            blocks.append(self._list(r, 1, ""))
+        for _ in range(self.tables):
+            blocks.append(self._table(r))
+        for _ in range(self.code_blocks):
+            blocks.append(self._code(r))
+        for _ in range(self.quotes):
+            blocks.append("> " + self._words(r, 10) + " " + self._link(r) + ".")
+        r.shuffle(blocks)
+        return "# " + self._words(r, 4) + "\n\n" + "\n\n".join(blocks) + "\n"
+
+    def documents(self, count, seed=0):
+        return [self.generate(seed + i) for i in range(count)]
+
+    def _words(self, r, n):
+        return " ".join(r.choice(WORDS) for _ in range(n))
+
+    def _link(self, r):
+        return (
+            "[" + self._words(r, 2) + "](https://example.com/" + r.choice(WORDS) + ")"
+        )
+
+    def _paragraph(self, r):
+        parts = [self._words(r, r.randint(5, 15))]
+        for _ in range(self.links):
+            parts.append(self._link(r))
+            parts.append(self._words(r, r.randint(3, 10)))
+        for _ in range(self.emphasis):
+            mark = r.choice(["*", "**", "`"])
+            parts.append(mark + self._words(r, 2) + mark)
+            parts.append(self._words(r, r.randint(3, 10)))
+        for _ in range(self.inline_html):
+            parts.append("<b>" + self._words(r, 2) + "</b>")
+            parts.append(self._words(r, r.randint(3, 10)))
+        # Spread the paragraph over a few lines, like hand written markdown
+        text = " ".join(parts).split(" ")
+        return "\n".join(" ".join(text[i : i + 12]) for i in range(0, len(text), 12))
+
+    def _list(self, r, level, indent):
+        marker = r.choice(["*", "-", "1."])
+        items = []
+        for _ in range(self.list_items):
+            items.append(indent + marker + " " + self._words(r, r.randint(3, 8)))
+            if level < self.list_depth and r.random() < 0.3:
+                # Sub-lists are indented to the text of the item, to be nested
+                sub_indent = indent + " " * (len(marker) + 1)
+                items.append(self._list(r, level + 1, sub_indent))
+        return "\n".join(items)
+
+    def _table(self, r):
+        cols = range(self.table_cols)
+        rows = ["| " + " | ".join(self._words(r, 2) for _ in cols) + " |"]
+        rows.append(
+            "|" + "|".join(r.choice(["---", ":--", "--:", ":-:"]) for _ in cols) + "|"
+        )
+        for _ in range(self.table_rows):
+            rows.append(
+                "| " + " | ".join(self._words(r, r.randint(1, 4)) for _ in cols) + " |"
+            )
+        return "\n".join(rows)
+
+    def _code(self, r):
+        lines = ["    " + self._words(r, 6) for _ in range(self.code_lines)]
+        return "```python\n" + "\n".join(lines) + "\n```"
@@ -0,0 +1,55 @@
+"""
+Check that conversion time grows linearly with the number of paragraphs.
+
+The time per paragraph printed in the last column should stay roughly the same
+as the document gets bigger.
+"""
+
+import argparse
+import time
+from md2gemini import md2gemini
+
+PARAGRAPH = (
+    "This is a paragraph with an [inline](https://example.com) link,\n"
+    "and some **bold** text spread over a couple of lines.\n\n"
+)
+
+
+def best_time(markdown, repeat, **kwargs):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        md2gemini(markdown, **kwargs)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--start", type=int, default=500, help="Smallest count.")
+    parser.add_argument("--steps", type=int, default=6, help="Number of doublings.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size.")
+    parser.add_argument("--links", default="paragraph", help="Link mode to use.")
+    args = parser.parse_args()
+
+    print(
+        "{:>12} {:>12} {:>12} {:>16}".format(
+            "paragraphs", "size (KB)", "time (s)", "us/paragraph"
+        )
+    )
+    count = args.start
+    for _ in range(args.steps):
+        markdown = PARAGRAPH * count
+        elapsed = best_time(markdown, args.repeat, links=args.links)
+        print(
+            "{:>12} {:>12.0f} {:>12.3f} {:>16.1f}".format(
+                count, len(markdown) / 1024, elapsed, elapsed / count * 1e6
+            )
+        )
+        count *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Time md2gemini on a synthetic corpus, for every link mode and other options.
+
+Results are printed as JSON, and can be compared with an earlier run using
+--compare.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import md2gemini
+from .corpus import Corpus
+
+CASES = {
+    "newline": {"links": "newline"},
+    "paragraph": {"links": "paragraph"},
+    "at-end": {"links": "at-end"},
+    "copy": {"links": "copy"},
+    "off": {"links": "off"},
+    "plain": {"plain": True},
+    "strip_html": {"strip_html": True},
+    "ascii_table": {"ascii_table": True},
+    "table_pipe": {"table_mode": "pipe"},
+    "table_tsv": {"table_mode": "tsv"},
+    "table_list": {"table_mode": "list"},
+}
+
+
+def measure(docs, options, repeat):
+    """Time converting all the docs, and get the peak memory used for one."""
+
+    size = sum(len(doc.encode("utf-8")) for doc in docs)
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for doc in docs:
+            md2gemini.md2gemini(doc, **options)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+
+    # Measured separately, since tracing makes everything slower
+    largest = max(docs, key=len)
+    tracemalloc.start()
+    md2gemini.md2gemini(largest, **options)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "seconds": round(best, 6),
+        "docs_per_sec": round(len(docs) / best, 2),
+        "mb_per_sec": round(size / best / 1e6, 3),
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def compare(results, old):
+    print(
+        "{:<14} {:>12} {:>12} {:>8}".format(
+            "case", "old docs/s", "new docs/s", "ratio"
+        ),
+        file=sys.stderr,
+    )
+    for name, new in results["cases"].items():
+        if name not in old["cases"]:
+            continue
+        before = old["cases"][name]["docs_per_sec"]
+        after = new["docs_per_sec"]
+        print(
+            "{:<14} {:>12.1f} {:>12.1f} {:>7.2f}x".format(
+                name, before, after, after / before
+            ),
+            file=sys.stderr,
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--docs", type=int, default=50, help="Number of documents.")
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Runs for each case, the best is kept."
+    )
+    parser.add_argument(
+        "--case", action="append", choices=sorted(CASES), help="Only run these cases."
+    )
+    parser.add_argument(
+        "--output", help="Write the JSON results to this file instead of stdout."
+    )
+    parser.add_argument(
+        "--compare", help="JSON results of an earlier run to compare with."
+    )
+    defaults = Corpus().settings()
+    for name, value in defaults.items():
+        parser.add_argument(
+            "--" + name.replace("_", "-"),
+            type=int,
+            default=value,
+            help="Corpus setting, defaults to " + str(value) + ".",
+        )
+    args = parser.parse_args()
+
+    corpus = Corpus(**{name: getattr(args, name) for name in defaults})
+    docs = corpus.documents(args.docs)
+    results = {
+        "md2gemini": md2gemini.__version__,
+        "python": platform.python_version(),
+        "docs": args.docs,
+        "corpus_bytes": sum(len(doc.encode("utf-8")) for doc in docs),
+        "corpus": corpus.settings(),
+        "cases": {},
+    }
+    for name in args.case or CASES:
+        results["cases"][name] = measure(docs, CASES[name], args.repeat)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,325 @@
 import mistune
-from .renderers import GeminiRenderer, NEWLINE, PARAGRAPH_DELIM, LINK_DELIM, LINEBREAK
-import argparse
-import sys
-import os
+from .renderers import GeminiRenderer, NEWLINE, MARKERS_EXPR
+from .postprocess import PostProcessor
 import re
+import threading
+import itertools
+import time
 
+# The command line and the asyncio API are imported when they're first used, so
+# that importing md2gemini stays quick.
 
-def __text_between(text, delim, n=0):
-    """Get the text between two delimeters.
 
-    n: Which occurence of the delimeter pair to act on, zero-indexed.
+class Converter:
+    """A reusable converter from markdown to the gemini format.
+
+    The options are the same as the ones for md2gemini, and are checked once here.
+    The renderer and the mistune parser are only created once, so converting many
+    documents with the same options is cheaper than calling md2gemini for each one.
+
+    A Converter keeps state while converting, so don't share one between threads.
+
+    stats: Count the calls and the time spent in the renderer methods, which are
+    then available as the stats dict after each conversion. See GeminiRenderer.
     """
 
-    return text.split(delim)[n + 1]
+    def __init__(
+        self,
+        code_tag="",
+        img_tag="[IMG]",
+        indent=" ",
+        ascii_table=False,
+        frontmatter=False,
+        jekyll=False,
+        links="newline",
+        plain=False,
+        strip_html=False,
+        base_url="",
+        md_links=False,
+        link_func=None,
+        table_tag="table",
+        checklist=True,
+        stats=False,
+        max_table_rows=None,
+        max_table_cells=None,
+        max_table_width=80,
+        table_mode="box",
+    ):
+        if link_func is not None and not callable(link_func):
+            raise TypeError("link_func must be callable")
+
+        self.frontmatter = frontmatter
+        self.jekyll = jekyll
+        self.renderer = GeminiRenderer(
+            code_tag=code_tag,
+            img_tag=img_tag,
+            indent=indent,
+            ascii_table=ascii_table,
+            links=links,
+            plain=plain,
+            strip_html=strip_html,
+            base_url=base_url,
+            md_links=md_links,
+            link_func=link_func,
+            table_tag=table_tag,
+            checklist=checklist,
+            stats=stats,
+            max_table_rows=max_table_rows,
+            max_table_cells=max_table_cells,
+            max_table_width=max_table_width,
+            table_mode=table_mode,
+        )
+        self._frontmatter = None  # The opening line and text of the last one
+        self._markdown = mistune.create_markdown(
+            escape=False, renderer=self.renderer, plugins=["table", "url", "task_lists"]
+        )
+        self._converting = False
+
+    @property
+    def stats(self):
+        """The renderer stats for the last conversion, or None if disabled."""
+
+        return self.renderer.stats
+
+    @property
+    def metadata(self):
+        """The front matter of the last conversion parsed into a dict, or None if
+        there wasn't any or it wasn't removed. See split_frontmatter for the
+        formats and what they need installed."""
+
+        if self._frontmatter is None:
+            return None
+        return _parse_frontmatter(*self._frontmatter)
+
+    def convert(self, markdown, instrument=None):
+        """Convert the provided markdown text to the gemini format.
+
+        instrument: See md2gemini.
+        """
+
+        return NEWLINE.join(self.convert_iter(markdown, instrument))
+
+    def convert_iter(self, markdown, instrument=None):
+        """Convert the provided markdown text or file to the gemini format,
+        yielding the gemtext lines.
+
+        The whole document is parsed first, but then lines are yielded as soon as
+        each top-level block has been rendered. Joining them with NEWLINE gives the
+        same text as convert(). The kind of each line is its class, see
+        md2gemini_iter.
+
+        instrument: See md2gemini.
+        """
+
+        if hasattr(markdown, "read"):
+            markdown = markdown.read()
+        self._frontmatter = None
+        if len(markdown) == 0:
+            return
+        yield from self._convert(markdown, instrument)
+
+    def _convert(self, markdown, instrument):
+        # The conversion, with each phase timed and measured for instrument.
+        # Without it, the timer does nothing and the sizes aren't counted.
+        timed = instrument is not None
+        timer = time.perf_counter if timed else _no_timer
+        phases = []
+
+        # Pre processing
+        start = timer()
+        body = self._remove_frontmatter(markdown)
+        if timed:
+            phases.append(("frontmatter", timer() - start, len(markdown), len(body)))
+
+        # Conversion
+        md = self._markdown
+        self._converting = True
+        try:
+            self.renderer.reset()
+            post = PostProcessor()
+            start = timer()
+            s, state = md.before_parse(_replace_markers(body), {})
+            tokens = md.before_render(md.block.parse(s, state), state)
+            if timed:
+                phases.append(("parse", timer() - start, len(body), len(tokens)))
+
+            render_time = post_time = 0.0
+            rendered = output = 0
+            for token in tokens:
+                # Most blocks are rendered by _render itself, tables are drawn
+                # as their lines are taken
+                start = timer()
+                texts = iter(self._render(token, state))
+                while True:
+                    text = next(texts, None)
+                    if text is None:
+                        break
+                    middle = timer()
+                    lines = post.feed(text)
+                    if timed:
+                        render_time += middle - start
+                        post_time += timer() - middle
+                        rendered += len(text)
+                        output += sum(map(len, lines)) + len(NEWLINE) * len(lines)
+                    yield from lines
+                    start = timer()
+            if timed:
+                phases.append(("render", render_time, len(tokens), rendered))
+
+            start = timer()
+            footnotes = self.renderer._render_footnotes()
+            if timed:
+                count = len(self.renderer.footnotes) if footnotes else 0
+                phases.append(("footnotes", timer() - start, count, len(footnotes)))
+
+            start = timer()
+            lines = post.close(footnotes)
+            if timed:
+                post_time += timer() - start
+                output += sum(map(len, lines)) + len(NEWLINE) * len(lines)
+                if output > 0:
+                    output -= len(NEWLINE)  # There's no newline after the last line
+                phases.append(
+                    ("postprocess", post_time, rendered + len(footnotes), output)
+                )
+            yield from lines
+        finally:
+            self._converting = False
+
+        for phase in phases:
+            instrument(*phase)
+
+    def _remove_frontmatter(self, markdown):
+        # Remember the front matter for metadata, and return the rest of the text
+        if not (self.frontmatter or self.jekyll):
+            return markdown
+        found = _find_frontmatter(markdown, self.frontmatter)
+        if found is None:
+            return markdown
+        opening, start, end, body = found
+        self._frontmatter = opening, markdown[start:end]
+        return markdown[body:]
+
+    def _render(self, token, state):
+        # Render a top-level block, returning an iterable of text. Tables are
+        # drawn line by line, instead of as one big string.
+        md = self._markdown
+        if token["type"] != "table":
+            return (md.block.render([token], md.inline, state),)
+        self.renderer.stream_tables = True
+        try:
+            text = md.block.render([token], md.inline, state)
+        finally:
+            self.renderer.stream_tables = False
+        lines = self.renderer.table_lines
+        self.renderer.table_lines = None
+        if lines is None:
+            return (text,)
+        return itertools.chain((text,), lines)
+
+
+def _no_timer():
+    # The timer used when conversions aren't instrumented
+    return 0.0
 
 
-def __replace_between(text, delim, new_text, n=0):
-    """Replace the text between two delimeters, and get the full text back.
+# Front matter is between two --- lines for Jekyll (YAML), or +++ for Zola (TOML)
+_FRONTMATTER_START_EXPR = re.compile(r"\s*(---|\+\+\+)(\r\n|\r|\n|\Z)")
+_FRONTMATTER_END_EXPR = re.compile(r"(?:\r\n|\r|\n)(?:---|\+\+\+)(?:\r\n|\r|\n|\Z)")
+_JEKYLL_END_EXPR = re.compile(r"(?:\r\n|\r|\n)---(?:\r\n|\r|\n|\Z)")
 
-    n: Which occurence of the delimeter pair to act on, zero-indexed.
+
+def _find_frontmatter(markdown, zola):
+    """Find the front matter at the start of the markdown, without copying it.
+
+    Returns the opening line, the start and end of the front matter text, and
+    where the rest of the document starts. Returns None if there's no front
+    matter. Zola style front matter is only found with zola.
     """
 
-    start = delim.join(text.split(delim)[: n + 1])
-    end = delim.join(text.split(delim)[n + 2 :])
-    # return start + delim + new_text + delim + end
-    return start + new_text + end
+    start = _FRONTMATTER_START_EXPR.match(markdown)
+    if start is None or (start.group(1) == "+++" and not zola):
+        return None
+    # The newline at the end of the first line can be the start of the last one
+    end_expr = _FRONTMATTER_END_EXPR if zola else _JEKYLL_END_EXPR
+    end = end_expr.search(markdown, start.start(2))
+    if end is None:
+        return None
+    return start.group(1), start.end(), max(start.end(), end.start()), end.end()
+
+
+def _replace_markers(markdown):
+    """Replace the control characters the renderer uses as markers, with U+FFFD
+    like CommonMark does for NUL. Left in, they would be taken for paragraphs,
+    links and line breaks."""
+
+    return MARKERS_EXPR.sub("\ufffd", markdown)
+
+
+def _parse_frontmatter(opening, text):
+    """Parse front matter text as YAML, or TOML if the opening line is +++."""
+
+    if opening == "+++":
+        try:
+            import tomllib
+        except ImportError:  # Before Python 3.11
+            import tomli as tomllib
+
+        return tomllib.loads(text)
+
+    import yaml
+
+    data = yaml.safe_load(text)
+    return {} if data is None else data
+
+
+def split_frontmatter(markdown, parse=False):
+    """Split Jekyll and Zola style front matter from the rest of the markdown.
+
+    Returns the front matter text, without its --- or +++ lines, and the markdown
+    after it. The front matter is None if the markdown doesn't start with it.
+
+    parse: Parse the front matter into a dict instead, as YAML for Jekyll style
+    front matter or TOML for Zola style. This needs PyYAML or, before Python 3.11,
+    tomli to be installed.
+    """
+
+    found = _find_frontmatter(markdown, True)
+    if found is None:
+        return None, markdown
+    opening, start, end, body = found
+    if parse:
+        return _parse_frontmatter(opening, markdown[start:end]), markdown[body:]
+    return markdown[start:end], markdown[body:]
+
+
+# Converters used by md2gemini, cached per thread and per set of options
+_converters = threading.local()
+_CONVERTER_CACHE_SIZE = 32
+
+
+def _get_converter(options):
+    """Get a Converter for the options, reusing a cached one when possible."""
+
+    try:
+        key = tuple(sorted(options.items()))
+        hash(key)
+    except TypeError:
+        # Unhashable option values can't be cached
+        return Converter(**options)
+
+    cache = getattr(_converters, "cache", None)
+    if cache is None:
+        cache = _converters.cache = {}
+    converter = cache.get(key)
+    if converter is None or converter._converting:
+        # A busy converter means md2gemini was called again from inside a
+        # conversion, through link_func for example.
+        converter = Converter(**options)
+        if len(cache) >= _CONVERTER_CACHE_SIZE:
+            cache.clear()
+        cache[key] = converter
+    return converter
 
 
 def md2gemini(
@@ -43,6 +338,11 @@ def md2gemini(
     link_func=None,
     table_tag="table",
     checklist=True,
+    max_table_rows=None,
+    max_table_cells=None,
+    max_table_width=80,
+    table_mode="box",
+    instrument=None,
 ):
     """Convert the provided markdown text to the gemini format.
     code_tag: The default alt text for code blocks.
@@ -77,290 +377,106 @@ def md2gemini(
     table_tag: "The default alt text for table blocks."
 
     checklist: whether to support GitHub-style checklist list items: [ ] and [x]
+
+    max_table_rows: The number of rows a table can have. The rows after that are
+    left out, and a line saying how many were left out is added. Defaults to no limit.
+
+    max_table_cells: The number of cells a table can have, header included. Bigger
+    tables are written as pipe-delimited rows instead of being drawn. Defaults to
+    no limit.
+
+    max_table_width: The width tables are drawn in, their cells are wrapped to fit.
+    Tables that can't fit are written as pipe-delimited rows. Put 0 for no limit.
+
+    table_mode: How tables are rendered. 'box' draws them with lines, 'pipe' writes
+    pipe-delimited rows and 'tsv' tab-separated rows, both in a preformatted block.
+    'list' writes a list item for each row, labelled with the header cells. All but
+    'box' write the rows as they come, which is much faster for big tables.
+
+    instrument: A function called after the conversion with the time spent in each
+    phase, as instrument(phase, seconds, input_size, output_size). The phases are
+    "frontmatter", "parse", "render", "footnotes" and "postprocess", and the sizes
+    are in characters. The exceptions are the output of "parse" and the input of
+    "render", which are the number of top-level blocks, and the input of "footnotes",
+    which is the number of footnotes added at the end of the document.
+
+    A Converter is reused between calls with the same options, see the Converter class.
     """
 
     if len(markdown) == 0:
         return ""
 
-    # Pre processing
-    # Remove frontmatter
-    frontmatterExists = False
-    if frontmatter:
-        lines = markdown.strip().splitlines()
-        if lines[0] == "---" or lines[0] == "+++":
-            frontmatterExists = True
-    elif jekyll:
-        lines = markdown.strip().splitlines()
-        if lines[0] == "---":
-            frontmatterExists = True
-
-    if frontmatterExists:
-        md_lines = []
-        for i, line in enumerate(lines[1:]):  # Skip first front matter line
-            if ((frontmatter or jekyll) and line == "---") or (
-                frontmatter and line == "+++"
-            ):
-                # End of frontmatter, add all the lines below it
-                md_lines.extend(lines[i + 2 :])
-                break
-        # Turn it back into text
-        if md_lines != []:
-            # If md_lines was empty, then effectively no removal would occur, and frontmatter would be processed
-            markdown = NEWLINE.join(md_lines)
-
-    # Conversion
-    renderer = GeminiRenderer(
-        code_tag=code_tag,
-        img_tag=img_tag,
-        indent=indent,
-        ascii_table=ascii_table,
-        links=links,
-        plain=plain,
-        strip_html=strip_html,
-        base_url=base_url,
-        md_links=md_links,
-        link_func=link_func,
-        table_tag=table_tag,
-        checklist=checklist,
-    )
-    gem = mistune.create_markdown(
-        escape=False, renderer=renderer, plugins=["table", "url", "task_lists"]
-    )
-    gemtext = gem(markdown)
-
-    # Post processing
-
-    # Remove newlines within paragraphs, and add two newlines after them.
-    while PARAGRAPH_DELIM in gemtext:  # While there's still unprocessed paragraphs
-        pg = __text_between(gemtext, PARAGRAPH_DELIM).strip()
-        pg = pg.replace("\r\n", "\n")  # Make all newlines the same
-        pg = pg.replace(
-            "\n", " "
-        )  # Get rid of newlines in the same paragraph, like markdown does
-        pg += NEWLINE * 2  # Add a blank line between paragraphs
-        gemtext = __replace_between(gemtext, PARAGRAPH_DELIM, pg)
-
-    # Add in hard linebreaks
-    gemtext = gemtext.replace(LINEBREAK, NEWLINE)
-
-    # Add remaining footnotes at and of file
-    gemtext += renderer._render_footnotes()
-
-    # Remove double link delims, which are produced by multiple footnotes
-    gemtext = gemtext.replace(LINK_DELIM + LINK_DELIM, LINK_DELIM)
-    # Remove all the link delims that are next to newlines,
-    # so that when link delims are replaced with newlines later in the code,
-    # we don't end up with double newlines.
-    gemtext = re.sub(
-        r"((?<=\r\n)|(?<=\n)" + LINK_DELIM + r")|(" + LINK_DELIM + r"(?=\r\n|\n))",
-        "",
-        gemtext,
-    )
-    gemtext = gemtext.replace(LINK_DELIM, NEWLINE)
-
-    # Remove left whitespace in the lines after links
-    gemlines = gemtext.splitlines()
-    if gemlines[-1] == "":
-        gemlines = gemlines[:-1]
-    pre = False  # Whether we're in a preformatted area or not
-    length = len(gemlines)
-    for i, line in enumerate(gemlines):
-        # Maintain preformatted state
-        if line.startswith("```"):
-            pre = not pre
-            continue
-        if i + 1 < length - 1 and line.startswith("=>") and not pre:
-            # It's a link, fix the next line by removing left whitespace
-            gemlines[i + 1] = gemlines[i + 1].lstrip()
-    gemtext = NEWLINE.join(gemlines)
-    gemtext = gemtext.rstrip().lstrip("\r\n")
-
-    return gemtext
-
-
-# Main functions, for running as a script
-
-
-def __convert_file(file, args):
-    if file == sys.stdin:
-        gem = md2gemini(
-            file.read(),
-            code_tag=args.code_tag,
-            img_tag=args.img_tag,
-            indent=args.indent,
-            ascii_table=args.ascii_table,
-            frontmatter=args.frontmatter,
-            jekyll=args.jekyll,
-            links=args.links,
-            plain=args.plain,
-            strip_html=args.strip_html,
-            base_url=args.base_url,
-            md_links=args.md_links,
-            link_func=None,
-            table_tag=args.table_tag,
-            checklist=not args.no_checklist,
+    converter = _get_converter(
+        dict(
+            code_tag=code_tag,
+            img_tag=img_tag,
+            indent=indent,
+            ascii_table=ascii_table,
+            frontmatter=frontmatter,
+            jekyll=jekyll,
+            links=links,
+            plain=plain,
+            strip_html=strip_html,
+            base_url=base_url,
+            md_links=md_links,
+            link_func=link_func,
+            table_tag=table_tag,
+            checklist=checklist,
+            max_table_rows=max_table_rows,
+            max_table_cells=max_table_cells,
+            max_table_width=max_table_width,
+            table_mode=table_mode,
         )
-        print(gem)
-    else:
-        with open(file, "r") as f:
-            gem = md2gemini(
-                f.read(),
-                code_tag=args.code_tag,
-                img_tag=args.img_tag,
-                indent=args.indent,
-                ascii_table=args.ascii_table,
-                frontmatter=args.frontmatter,
-                jekyll=args.jekyll,
-                links=args.links,
-                plain=args.plain,
-                strip_html=args.strip_html,
-                base_url=args.base_url,
-                md_links=args.md_links,
-                link_func=None,
-                table_tag=args.table_tag,
-                checklist=not args.no_checklist,
-            )
-        if args.write:
-            newfile = os.path.splitext(os.path.basename(file))[0] + ".gmi"
-            with open(os.path.join(args.dir, newfile), "w") as f:
-                f.write(gem)
-        else:
-            print(gem)
+    )
+    return converter.convert(markdown, instrument)
+
+
+def md2gemini_iter(markdown, **options):
+    """Convert the provided markdown text or file to the gemini format,
+    yielding the gemtext lines as each top-level block is rendered.
+
+    The options are the same as for md2gemini. Joining the lines with NEWLINE
+    gives the same text md2gemini would return. With links="at-end", the
+    footnotes are yielded at the end.
+
+    The lines are strings, of the md2gemini.gemtext class of their kind: Text,
+    Link, Heading, ListItem, Quote, PreformatToggle or Preformatted.
+    """
+
+    instrument = options.pop("instrument", None)
+    yield from _get_converter(options).convert_iter(markdown, instrument)
 
 
 def main():
-    parser = argparse.ArgumentParser(
-        description="Convert markdown to gemini.", prog="md2gemini"
-    )
-    parser.add_argument("--version", action="version", version=__version__)
-    parser.add_argument(
-        "file",
-        nargs="*",
-        help="Files to convert. If no files are specified then data will be read from stdin and printed to stdout.",
-    )
-    parser.add_argument(
-        "-w",
-        "--write",
-        action="store_true",
-        help="Write output to a new file of the same name, but with a .gmi extension.",
-    )
-    parser.add_argument(
-        "-d", "--dir", help="The directory to write files to, if --write is used."
-    )
-    parser.add_argument(
-        "-a",
-        "--ascii-table",
-        action="store_true",
-        help="Use ASCII to create tables, not Unicode.",
-    )
-    parser.add_argument(
-        "-f",
-        "--frontmatter",
-        action="store_true",
-        help="Remove Jekyll and Zola style front matter before converting.",
-    )
-    parser.add_argument(
-        "-j",
-        "--jekyll",
-        action="store_true",
-        help="Skip jekyll frontmatter when processing - DEPRECATED.",
-    )
-    parser.add_argument(
-        "--code-tag",
-        type=str,
-        help="What alt text to add to unlabeled code blocks. Defaults to empty string.",
-    )
-    parser.add_argument(
-        "--img-tag",
-        type=str,
-        help="What text to add after image links. Defaults to '[IMG]'.\nWrite something like --img-tag='' to remove it.",
-    )
-    parser.add_argument(
-        "--table-tag",
-        type=str,
-        help="What alt text to add to table blocks. Defaults to 'table'.\nWrite something like --table-tag='' to remove it.",
-    )
-    parser.add_argument(
-        "-i",
-        "--indent",
-        type=str,
-        help="The number of spaces to use for list indenting. Put 'tab' to use a tab instead.",
-    )
-    parser.add_argument(
-        "-l",
-        "--links",
-        type=str,
-        help="Set to 'off' to turn off links, 'paragraph' to have footnotes at the end of each paragraph, or 'at-end' to have footnotes at the end of the document. You can also set it to 'copy' to put links that copy the inline link text after each paragraph. Not using this flag, or having any other value will result in regular, newline links.",
-    )
-    parser.add_argument(
-        "-p",
-        "--plain",
-        action="store_true",
-        help="Remove special markings from output that text/gemini doesn't support, like the asterisks for bold and italics, and inline HTML",
-    )
-    parser.add_argument(
-        "-s",
-        "--strip-html",
-        action="store_true",
-        help="Strip all inline and block HTML from Markdown. Note that using --plain will strip inline HTML as well.",
-    )
-    parser.add_argument(
-        "-b",
-        "--base-url",
-        type=str,
-        help="All links starting with a slash will have this URL prepended to them.",
-    )
-    parser.add_argument(
-        "-m",
-        "--md-links",
-        action="store_true",
-        help="Convert all links to local files ending in .md to end with .gmi instead.",
-    )
-    parser.add_argument(
-        "-c",
-        "--no-checklist",
-        action="store_true",
-        help="Disable rendering of GitHub-style checklist list items: [ ] and [x]",
-    )
-    args = parser.parse_args()
-
-    # Validation of command line args
-    if args.write and args.dir is None:
-        args.dir = "."
-    if args.write and not os.path.isdir(args.dir):
-        print("Directory", args.dir, "cannot be found.", file=sys.stderr)
-        sys.exit(1)
-    if args.indent == "tab":
-        args.indent = "\t"
-    elif not args.indent is None:
-        try:
-            args.indent = " " * int(args.indent)
-        except ValueError:
-            print(
-                "Invalid indent value. Must be an integer, or 'tab'.", file=sys.stderr
-            )
-            sys.exit(1)
-    if args.code_tag is None:
-        args.code_tag = ""
-
-    if args.img_tag is None:
-        args.img_tag = "[IMG]"
-
-    if args.table_tag is None:
-        args.table_tag = "table"
-
-    # If there aren't any files then read from stdin
-    if args.file == []:
-        __convert_file(sys.stdin, args)
-        sys.exit(0)
-
-    # Process each file sequentially
-    for file in args.file:
-        if not os.path.isfile(file):
-            print("File", file, "cannot be found.", file=sys.stderr)
-            sys.exit(1)
-        __convert_file(file, args)
-
-
-__all__ = ["GeminiRenderer", "md2gemini", "main", "NEWLINE", "__version__"]
+    """Run the command line program, see md2gemini/cli.py."""
+
+    # The command line is imported here, so that importing md2gemini doesn't
+    # load it and its modules
+    from . import cli
+
+    cli.main()
+
+
+__all__ = [
+    "GeminiRenderer",
+    "Converter",
+    "md2gemini",
+    "md2gemini_iter",
+    "split_frontmatter",
+    "AsyncConverter",
+    "md2gemini_async",
+    "main",
+    "NEWLINE",
+    "__version__",
+]
 __version__ = "1.9.1"
+
+
+def __getattr__(name):
+    # asyncio takes longer to import than everything else, so the asyncio API
+    # is only imported when it's asked for
+    if name in ("AsyncConverter", "md2gemini_async"):
+        from . import aio
+
+        return getattr(aio, name)
+    raise AttributeError("module " + repr(__name__) + " has no attribute " + repr(name))
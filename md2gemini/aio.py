@@ -0,0 +1,171 @@
+"""
+Converting markdown from asyncio code, without blocking the event loop.
+"""
+
+import asyncio
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+
+def _convert(options, markdown):
+    # Runs in the executor. md2gemini keeps a Converter per thread, so the
+    # renderer isn't rebuilt for every conversion.
+    from . import md2gemini
+
+    return md2gemini(markdown, **options)
+
+
+class AsyncConverter:
+    """Converts markdown in an executor, with a limit on how many conversions
+    run at the same time.
+
+    executor: "thread" or "process" to create a pool of that kind, or an existing
+    concurrent.futures executor, which won't be shut down by close().
+
+    max_workers: The number of workers of a created pool. Defaults to the number
+    of CPUs.
+
+    max_concurrency: How many conversions can run at the same time. Defaults to
+    max_workers.
+
+    max_queue: How many conversions can wait for their turn. When the queue is full,
+    convert() raises asyncio.QueueFull right away, so the caller can refuse the
+    request instead of piling it up. Defaults to no limit.
+
+    The other keyword arguments are the options of md2gemini. With a process
+    executor, they need to be picklable, which rules out lambdas for link_func.
+
+    Cancelling a conversion that is waiting for its turn removes it from the queue.
+    One that is already running can't be stopped, it finishes in the background
+    and keeps its place in the limit until then.
+    """
+
+    def __init__(
+        self,
+        executor="thread",
+        max_workers=None,
+        max_concurrency=None,
+        max_queue=None,
+        **options
+    ):
+        from . import Converter
+
+        Converter(**options)  # Check the options now, instead of in the executor
+        self.options = options
+
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        if executor == "thread":
+            self._executor = ThreadPoolExecutor(max_workers)
+            self._owns_executor = True
+        elif executor == "process":
+            self._executor = ProcessPoolExecutor(max_workers)
+            self._owns_executor = True
+        elif isinstance(executor, str):
+            raise ValueError('executor must be "thread", "process" or an executor')
+        else:
+            self._executor = executor
+            self._owns_executor = False
+
+        if max_concurrency is None:
+            max_concurrency = max_workers
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+
+        # The limit is shared between event loops and executor threads
+        self._lock = threading.Lock()
+        self._running = 0
+        self._waiters = deque()  # (loop, future) for each waiting conversion
+
+    async def convert(self, markdown):
+        """Convert the provided markdown text to the gemini format."""
+
+        return await self._convert(self.options, markdown)
+
+    def close(self):
+        """Shut down the executor, if it was created by this AsyncConverter."""
+
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    async def _convert(self, options, markdown):
+        await self._acquire()
+        try:
+            future = self._executor.submit(_convert, options, markdown)
+        except BaseException:
+            self._release()
+            raise
+        # The slot is released when the work is really done, even if the
+        # caller stopped waiting for it.
+        future.add_done_callback(lambda f: self._release())
+        return await asyncio.wrap_future(future)
+
+    async def _acquire(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._running < self.max_concurrency and not self._waiters:
+                self._running += 1
+                return
+            if self.max_queue is not None and len(self._waiters) >= self.max_queue:
+                raise asyncio.QueueFull("too many conversions are waiting")
+            waiter = loop.create_future()
+            self._waiters.append((loop, waiter))
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            with self._lock:
+                try:
+                    self._waiters.remove((loop, waiter))
+                    handed_over = False
+                except ValueError:
+                    handed_over = True
+            # If the waiter was cancelled after getting the slot, _wake releases it
+            if handed_over and not waiter.cancelled():
+                self._release()
+            raise
+
+    def _release(self):
+        # Give the slot to the next waiting conversion, if there is one
+        with self._lock:
+            while self._waiters:
+                loop, waiter = self._waiters.popleft()
+                try:
+                    loop.call_soon_threadsafe(self._wake, waiter)
+                    return
+                except RuntimeError:
+                    pass  # Its event loop is closed
+            self._running -= 1
+
+    def _wake(self, waiter):
+        if waiter.cancelled():
+            self._release()
+        else:
+            waiter.set_result(None)
+
+
+_default_converter = None
+
+
+async def md2gemini_async(markdown, **options):
+    """Convert the provided markdown text to the gemini format, in a thread so the
+    event loop isn't blocked.
+
+    The options are the same as for md2gemini. All calls share one AsyncConverter,
+    which runs as many conversions at a time as there are CPUs.
+    """
+
+    global _default_converter
+    if _default_converter is None:
+        _default_converter = AsyncConverter()
+    return await _default_converter._convert(options, markdown)
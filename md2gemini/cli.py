@@ -0,0 +1,669 @@
+"""
+The command line program, run by md2gemini.main().
+"""
+
+import argparse
+import cProfile
+import fnmatch
+import hashlib
+import json
+import os
+import pstats
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from . import Converter, __version__
+from .renderers import TABLE_MODES
+
+
+def __options(args):
+    """Get the Converter options from the command line arguments."""
+
+    return dict(
+        code_tag=args.code_tag,
+        img_tag=args.img_tag,
+        indent=args.indent,
+        ascii_table=args.ascii_table,
+        frontmatter=args.frontmatter,
+        jekyll=args.jekyll,
+        links=args.links,
+        plain=args.plain,
+        strip_html=args.strip_html,
+        base_url=args.base_url,
+        md_links=args.md_links,
+        link_func=None,
+        table_tag=args.table_tag,
+        checklist=not args.no_checklist,
+        max_table_rows=args.max_table_rows,
+        max_table_cells=args.max_table_cells,
+        max_table_width=args.max_table_width,
+        table_mode=args.table_mode,
+    )
+
+
+def __matches(name, patterns):
+    """Whether the relative path matches one of the glob patterns. Patterns
+    without a slash are matched against the file name only."""
+
+    for pattern in patterns:
+        if "/" in pattern:
+            if fnmatch.fnmatch(name, pattern):
+                return True
+        elif fnmatch.fnmatch(name.rsplit("/", 1)[-1], pattern):
+            return True
+    return False
+
+
+def __walk(root, args):
+    """Find the files to convert in a directory tree.
+
+    Returns a sorted list of (path, name) tuples, where name is the path relative
+    to root, using slashes.
+    """
+
+    found = []
+    dirs = [""]
+    while dirs:
+        rel = dirs.pop()
+        with os.scandir(os.path.join(root, rel)) as entries:
+            for entry in entries:
+                name = rel + entry.name
+                if __matches(name, args.exclude):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.append(name + "/")
+                elif entry.is_file() and __matches(name, args.include):
+                    found.append((entry.path, name))
+    found.sort(key=lambda f: f[1])
+    return found
+
+
+def __find_files(args):
+    """Yield (path, name) tuples for the files to convert, where name is the path
+    of the output file relative to the output directory, before the extension
+    is changed. Files that can't be found have a name of None.
+    """
+
+    for file in args.file:
+        if args.recursive and os.path.isdir(file):
+            yield from __walk(file, args)
+        elif os.path.isfile(file):
+            yield file, os.path.basename(file)
+        else:
+            yield file, None
+
+
+def __output_path(name, args):
+    return os.path.join(args.dir, os.path.splitext(name)[0] + ".gmi")
+
+
+def __write_file(gem, name, args):
+    path = __output_path(name, args)
+    if "/" in name:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(gem)
+
+
+def __convert_file(file, name, args, converter, known_hash=None):
+    """Convert a file, and write it if --write is used.
+
+    Returns the gemtext if it wasn't written, and the hash of the file content
+    for incremental builds. If that hash is the same as known_hash, the file
+    isn't converted again.
+    """
+
+    with open(file, "r") as f:
+        text = f.read()
+    digest = None
+    if args.incremental:
+        digest = hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+        if digest == known_hash:
+            return None, digest
+    if args.profile:
+        gem = __profile_convert(text, name, args, converter)
+    else:
+        gem = converter.convert(text)
+    if args.write:
+        __write_file(gem, name, args)
+        return None, digest
+    return gem, digest
+
+
+# Profiling
+
+
+class _StackProfiler:
+    """Records the time spent in each call stack, to write collapsed stack files
+    that flame graph tools can read."""
+
+    def __init__(self):
+        self.stacks = {}
+        self._stack = []
+        self._last = 0.0
+
+    def __call__(self, frame, event, arg):
+        now = time.perf_counter()
+        if self._stack:
+            stack = tuple(self._stack)
+            self.stacks[stack] = self.stacks.get(stack, 0.0) + now - self._last
+        if event == "call":
+            code = frame.f_code
+            self._stack.append(os.path.basename(code.co_filename) + ":" + code.co_name)
+        elif event == "c_call":
+            self._stack.append(getattr(arg, "__qualname__", repr(arg)))
+        elif self._stack:
+            self._stack.pop()
+        # Leave out the time spent in here
+        self._last = time.perf_counter()
+
+    def write(self, path):
+        """Write the stacks, with their time in microseconds."""
+
+        with open(path, "w") as f:
+            for stack, seconds in sorted(self.stacks.items()):
+                micros = round(seconds * 1e6)
+                if micros > 0:
+                    f.write(";".join(stack) + " " + str(micros) + "\n")
+
+
+def __profile_convert(text, name, args, converter):
+    """Convert the text while profiling it. A pstats file, a collapsed stack
+    file and a text summary are written to the --profile directory."""
+
+    base = os.path.join(args.profile, os.path.splitext(name)[0])
+    if "/" in name:
+        os.makedirs(os.path.dirname(base), exist_ok=True)
+
+    profile = cProfile.Profile()
+    gem = profile.runcall(converter.convert, text)
+    profile.dump_stats(base + ".pstats")
+    with open(base + ".txt", "w") as f:
+        pstats.Stats(profile, stream=f).sort_stats("tottime").print_stats(30)
+    args.profiles.append(base + ".pstats")
+
+    # cProfile only knows about callers and callees, not whole stacks,
+    # so the stacks are recorded in a second conversion.
+    stacks = _StackProfiler()
+    sys.setprofile(stacks)
+    try:
+        converter.convert(text)
+    finally:
+        sys.setprofile(None)
+    stacks.write(base + ".collapsed")
+
+    return gem
+
+
+# Incremental builds
+
+MANIFEST_NAME = ".md2gemini-manifest.json"
+
+
+def __load_manifest(args, options):
+    """Load the manifest of an incremental build from the output directory.
+
+    It's discarded if the options or the md2gemini version have changed.
+    """
+
+    version = repr(sorted(options.items())) + __version__
+    version = hashlib.sha256(version.encode("utf-8")).hexdigest()
+    try:
+        with open(os.path.join(args.dir, MANIFEST_NAME), "r") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = None
+    if not isinstance(manifest, dict) or manifest.get("options") != version:
+        manifest = {"options": version, "files": {}}
+    return manifest
+
+
+def __save_manifest(manifest, args):
+    path = os.path.join(args.dir, MANIFEST_NAME)
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f)
+    os.replace(path + ".tmp", path)
+
+
+def __check_manifest(file, name, args, manifest):
+    """Check a file against the manifest of an incremental build.
+
+    Returns the size and modification time of the file, whether they're the
+    same as when it was last converted, and the hash its content had then.
+    """
+
+    st = os.stat(file)
+    stat = [st.st_size, st.st_mtime_ns]
+    entry = manifest["files"].get(os.path.abspath(file))
+    if entry is None or not os.path.exists(__output_path(name, args)):
+        return stat, False, None
+    return stat, entry["stat"] == stat, entry["hash"]
+
+
+def __build_file(file, name, args, converter, manifest):
+    """Convert a file, unless the manifest of an incremental build shows it
+    hasn't changed. Returns the gemtext if it wasn't written."""
+
+    if manifest is None:
+        return __convert_file(file, name, args, converter)[0]
+    stat, unchanged, known_hash = __check_manifest(file, name, args, manifest)
+    if unchanged:
+        return None
+    gem, digest = __convert_file(file, name, args, converter, known_hash)
+    manifest["files"][os.path.abspath(file)] = {"stat": stat, "hash": digest}
+    return gem
+
+
+# Watch mode
+
+
+def __scan(args):
+    """Get the size and modification time of all the files to convert."""
+
+    stats = {}
+    for file, name in __find_files(args):
+        if name is None:
+            continue
+        try:
+            st = os.stat(file)
+        except OSError:
+            continue
+        stats[file, name] = (st.st_size, st.st_mtime_ns)
+    return stats
+
+
+def __watch(args, converter, manifest):
+    """Convert files again when they change, until interrupted."""
+
+    stats = __scan(args)
+    print("Watching for changes, press Ctrl-C to stop.", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(args.interval)
+            new_stats = __scan(args)
+            if new_stats == stats:
+                continue
+            # Wait for the files to stop changing, so that editors saving
+            # several times in a row only cause one conversion.
+            while True:
+                time.sleep(args.interval)
+                latest = __scan(args)
+                if latest == new_stats:
+                    break
+                new_stats = latest
+
+            changed = [f for f in new_stats if stats.get(f) != new_stats[f]]
+            stats = new_stats
+            for file, name in sorted(changed):
+                try:
+                    gem = __build_file(file, name, args, converter, manifest)
+                except Exception as e:
+                    print("Error converting " + file + ": " + str(e), file=sys.stderr)
+                    continue
+                if gem is not None:
+                    print(gem)
+                elif args.write:
+                    print("Converted", file, file=sys.stderr)
+            if manifest is not None:
+                __save_manifest(manifest, args)
+    except KeyboardInterrupt:
+        pass
+
+
+def __print_profile_summary(args):
+    if args.profiles == []:
+        return
+    print("Profiles written to " + args.profile + ".", file=sys.stderr)
+    stats = pstats.Stats(*args.profiles, stream=sys.stderr)
+    stats.sort_stats("tottime").print_stats(15)
+
+
+# The Converter of a worker process, when converting files in parallel
+_worker_converter = None
+
+
+def __init_worker(options):
+    global _worker_converter
+    _worker_converter = Converter(**options)
+
+
+def __convert_worker(file, name, args, known_hash):
+    """Convert a file in a worker process.
+
+    Returns the same as __convert_file, and an error message if the conversion
+    failed.
+    """
+
+    try:
+        return __convert_file(file, name, args, _worker_converter, known_hash) + (None,)
+    except Exception as e:
+        return None, None, "Error converting " + file + ": " + str(e)
+
+
+def __convert_files_parallel(files, args, options, manifest):
+    """Convert files with a pool of worker processes.
+
+    files is a list of (path, name) tuples from __find_files. Output and errors
+    are reported in the order of the files, and a file failing doesn't stop the
+    others. Returns whether all files were converted.
+    """
+
+    ok = True
+    with ProcessPoolExecutor(
+        max_workers=args.jobs, initializer=__init_worker, initargs=(options,)
+    ) as pool:
+        jobs = []
+        for i, (file, name) in enumerate(files):
+            if name is None:
+                continue
+            if manifest is None:
+                stat, known_hash = [os.path.getsize(file)], None
+            else:
+                stat, unchanged, known_hash = __check_manifest(
+                    file, name, args, manifest
+                )
+                if unchanged:
+                    continue
+            jobs.append((stat, i, file, name, known_hash))
+
+        # Start with the largest files, so that a big one doesn't end up
+        # running alone after all the others are done. A file given twice is
+        # converted twice, like when converting sequentially.
+        futures = {}
+        for stat, i, file, name, known_hash in sorted(
+            jobs, key=lambda job: job[0], reverse=True
+        ):
+            future = pool.submit(__convert_worker, file, name, args, known_hash)
+            futures[i] = stat, future
+
+        for i, (file, name) in enumerate(files):
+            if name is None:
+                print("File", file, "cannot be found.", file=sys.stderr)
+                ok = False
+                continue
+            if i not in futures:
+                continue  # Unchanged since the last build
+            stat, future = futures.pop(i)
+            gem, digest, error = future.result()
+            if error is not None:
+                print(error, file=sys.stderr)
+                ok = False
+                continue
+            if manifest is not None:
+                manifest["files"][os.path.abspath(file)] = {
+                    "stat": stat,
+                    "hash": digest,
+                }
+            if gem is not None:
+                print(gem)
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert markdown to gemini.", prog="md2gemini"
+    )
+    parser.add_argument("--version", action="version", version=__version__)
+    parser.add_argument(
+        "file",
+        nargs="*",
+        help="Files to convert. If no files are specified then data will be read from stdin and printed to stdout.",
+    )
+    parser.add_argument(
+        "-w",
+        "--write",
+        action="store_true",
+        help="Write output to a new file of the same name, but with a .gmi extension.",
+    )
+    parser.add_argument(
+        "-d", "--dir", help="The directory to write files to, if --write is used."
+    )
+    parser.add_argument(
+        "-a",
+        "--ascii-table",
+        action="store_true",
+        help="Use ASCII to create tables, not Unicode.",
+    )
+    parser.add_argument(
+        "-f",
+        "--frontmatter",
+        action="store_true",
+        help="Remove Jekyll and Zola style front matter before converting.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jekyll",
+        action="store_true",
+        help="Skip jekyll frontmatter when processing - DEPRECATED.",
+    )
+    parser.add_argument(
+        "--code-tag",
+        type=str,
+        help="What alt text to add to unlabeled code blocks. Defaults to empty string.",
+    )
+    parser.add_argument(
+        "--img-tag",
+        type=str,
+        help="What text to add after image links. Defaults to '[IMG]'.\nWrite something like --img-tag='' to remove it.",
+    )
+    parser.add_argument(
+        "--table-tag",
+        type=str,
+        help="What alt text to add to table blocks. Defaults to 'table'.\nWrite something like --table-tag='' to remove it.",
+    )
+    parser.add_argument(
+        "-i",
+        "--indent",
+        type=str,
+        help="The number of spaces to use for list indenting. Put 'tab' to use a tab instead.",
+    )
+    parser.add_argument(
+        "-l",
+        "--links",
+        type=str,
+        help="Set to 'off' to turn off links, 'paragraph' to have footnotes at the end of each paragraph, or 'at-end' to have footnotes at the end of the document. You can also set it to 'copy' to put links that copy the inline link text after each paragraph. Not using this flag, or having any other value will result in regular, newline links.",
+    )
+    parser.add_argument(
+        "-p",
+        "--plain",
+        action="store_true",
+        help="Remove special markings from output that text/gemini doesn't support, like the asterisks for bold and italics, and inline HTML",
+    )
+    parser.add_argument(
+        "-s",
+        "--strip-html",
+        action="store_true",
+        help="Strip all inline and block HTML from Markdown. Note that using --plain will strip inline HTML as well.",
+    )
+    parser.add_argument(
+        "-b",
+        "--base-url",
+        type=str,
+        help="All links starting with a slash will have this URL prepended to them.",
+    )
+    parser.add_argument(
+        "-m",
+        "--md-links",
+        action="store_true",
+        help="Convert all links to local files ending in .md to end with .gmi instead.",
+    )
+    parser.add_argument(
+        "-c",
+        "--no-checklist",
+        action="store_true",
+        help="Disable rendering of GitHub-style checklist list items: [ ] and [x]",
+    )
+    parser.add_argument(
+        "--table-mode",
+        choices=TABLE_MODES,
+        default="box",
+        help="How to render tables: 'box' draws them with lines, 'pipe' and 'tsv' write pipe-delimited or tab-separated rows, and 'list' writes a list item for each row. Defaults to 'box'.",
+    )
+    parser.add_argument(
+        "--max-table-rows",
+        type=int,
+        metavar="N",
+        help="The number of rows a table can have. Rows after that are left out, and a line saying how many were left out is added.",
+    )
+    parser.add_argument(
+        "--max-table-cells",
+        type=int,
+        metavar="N",
+        help="The number of cells a table can have. Bigger tables are written as pipe-delimited rows instead of being drawn.",
+    )
+    parser.add_argument(
+        "--max-table-width",
+        type=int,
+        metavar="N",
+        help="The width tables are drawn in. Tables that can't fit are written as pipe-delimited rows. Defaults to 80, put 0 for no limit.",
+    )
+    parser.add_argument(
+        "-r",
+        "--recursive",
+        action="store_true",
+        help="Convert all the files in directories and their subdirectories. With --write, the directory structure is kept in the output directory.",
+    )
+    parser.add_argument(
+        "--include",
+        action="append",
+        metavar="GLOB",
+        help="Only convert files matching this pattern when using --recursive. Can be used more than once. Defaults to '*.md'.",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        metavar="GLOB",
+        default=[],
+        help="Skip files and directories matching this pattern when using --recursive. Can be used more than once.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only convert files that changed since the last build, when using --write. A manifest file is kept in the output directory to track this.",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running after converting, and convert files again when they change.",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.5,
+        help="How often to check for changes with --watch, in seconds. Defaults to 0.5.",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="DIR",
+        help="Profile the conversion of each file, and write the results to this directory: a pstats file, a collapsed stack file for flame graphs, and a text summary. The functions that took the most time overall are printed at the end.",
+    )
+    parser.add_argument(
+        "-J",
+        "--jobs",
+        type=int,
+        default=1,
+        help="The number of files to convert in parallel. Put 0 to use one job per CPU. Defaults to 1.",
+    )
+    args = parser.parse_args()
+
+    # Validation of command line args
+    if args.write and args.dir is None:
+        args.dir = "."
+    if args.write and not os.path.isdir(args.dir):
+        print("Directory", args.dir, "cannot be found.", file=sys.stderr)
+        sys.exit(1)
+    if args.indent == "tab":
+        args.indent = "\t"
+    elif not args.indent is None:
+        try:
+            args.indent = " " * int(args.indent)
+        except ValueError:
+            print(
+                "Invalid indent value. Must be an integer, or 'tab'.", file=sys.stderr
+            )
+            sys.exit(1)
+    if args.code_tag is None:
+        args.code_tag = ""
+
+    if args.img_tag is None:
+        args.img_tag = "[IMG]"
+
+    if args.table_tag is None:
+        args.table_tag = "table"
+
+    if args.jobs < 0:
+        print("Invalid jobs value. Must be 0 or more.", file=sys.stderr)
+        sys.exit(1)
+    if args.jobs == 0:
+        args.jobs = os.cpu_count() or 1
+
+    options = __options(args)
+
+    if args.include is None:
+        args.include = ["*.md"]
+
+    if args.incremental and not args.write:
+        print("--incremental can only be used with --write.", file=sys.stderr)
+        sys.exit(1)
+
+    if args.watch and args.file == []:
+        print("--watch needs files or directories to watch.", file=sys.stderr)
+        sys.exit(1)
+    if args.interval <= 0:
+        print("Invalid interval value. Must be more than 0.", file=sys.stderr)
+        sys.exit(1)
+
+    if args.profile is not None:
+        if args.jobs != 1:
+            print("--profile can't be used with --jobs.", file=sys.stderr)
+            sys.exit(1)
+        os.makedirs(args.profile, exist_ok=True)
+        args.profiles = []
+
+    # If there aren't any files then read from stdin
+    if args.file == []:
+        converter = Converter(**options)
+        if args.profile is None:
+            print(converter.convert(sys.stdin.read()))
+        else:
+            print(__profile_convert(sys.stdin.read(), "stdin", args, converter))
+            __print_profile_summary(args)
+        sys.exit(0)
+
+    manifest = None
+    if args.incremental:
+        manifest = __load_manifest(args, options)
+
+    files = __find_files(args)
+    if args.jobs > 1:
+        files = list(files)
+        if len(files) > 1:
+            try:
+                ok = __convert_files_parallel(files, args, options, manifest)
+            finally:
+                if manifest is not None:
+                    __save_manifest(manifest, args)
+            if not ok:
+                sys.exit(1)
+            if args.watch:
+                __watch(args, Converter(**options), manifest)
+            return
+
+    # Process each file sequentially
+    converter = Converter(**options)
+    try:
+        for file, name in files:
+            if name is None:
+                print("File", file, "cannot be found.", file=sys.stderr)
+                sys.exit(1)
+            gem = __build_file(file, name, args, converter, manifest)
+            if gem is not None:
+                print(gem)
+    finally:
+        if manifest is not None:
+            __save_manifest(manifest, args)
+
+    if args.profile is not None:
+        __print_profile_summary(args)
+    if args.watch:
+        __watch(args, converter, manifest)
@@ -0,0 +1,106 @@
+"""
+The kinds of gemtext lines, for the lines output by the converter.
+"""
+
+
+class Line(str):
+    """A line of gemtext, without its newline. The class tells what kind of line
+    it is, and the string is the line as it's written out, so lines can be joined
+    with NEWLINE to get the document."""
+
+    __slots__ = ()
+
+
+class Text(Line):
+    """A text line. Blank lines and the items of ordered or nested lists are text
+    lines too."""
+
+    __slots__ = ()
+
+
+class Link(Line):
+    """A link line, => followed by the URL and an optional text."""
+
+    __slots__ = ()
+
+    @property
+    def url(self):
+        parts = self[2:].split(None, 1)
+        return parts[0] if parts else ""
+
+    @property
+    def text(self):
+        parts = self[2:].split(None, 1)
+        return parts[1] if len(parts) > 1 else ""
+
+
+class Heading(Line):
+    """A heading line, starting with one to three #."""
+
+    __slots__ = ()
+
+    @property
+    def level(self):
+        return min(len(self) - len(self.lstrip("#")), 3)
+
+    @property
+    def text(self):
+        return self.lstrip("#").strip()
+
+
+class ListItem(Line):
+    """An unordered list item, starting with "* "."""
+
+    __slots__ = ()
+
+    @property
+    def text(self):
+        return self[2:]
+
+
+class Quote(Line):
+    """A quote line, starting with >."""
+
+    __slots__ = ()
+
+    @property
+    def text(self):
+        return self[1:].strip()
+
+
+class PreformatToggle(Line):
+    """A ``` line, which starts or ends preformatted text."""
+
+    __slots__ = ()
+
+    @property
+    def alt(self):
+        """The alt text after the ``` of a starting line, like the table tag."""
+
+        return self[3:].strip()
+
+
+class Preformatted(Line):
+    """A line between two preformat toggle lines, shown as it is."""
+
+    __slots__ = ()
+
+
+# The kinds of lines with a prefix, by the first character of the prefix
+_PREFIXES = {
+    "=": ("=>", Link),
+    "#": ("#", Heading),
+    "*": ("* ", ListItem),
+    ">": (">", Quote),
+}
+
+
+def parse_line(line):
+    """Return the line as the kind of line it is outside preformatted text.
+    PreformatToggle and Preformatted lines depend on the lines before them, so
+    they're left to the caller."""
+
+    prefix = _PREFIXES.get(line[:1])
+    if prefix is not None and line.startswith(prefix[0]):
+        return prefix[1](line)
+    return Text(line)
@@ -0,0 +1,161 @@
+"""
+Post processing of the GeminiRenderer output, into the final gemtext lines.
+"""
+
+import re
+from collections import deque
+from .renderers import NEWLINE, PARAGRAPH_DELIM, LINK_DELIM, LINEBREAK
+from .gemtext import PreformatToggle, Preformatted, parse_line
+
+LINK_DELIMS_EXPR = re.compile(LINK_DELIM + "+")
+
+
+class PostProcessor:
+    """Turns rendered text into gemtext lines, in a single pass.
+
+    The rendered text can be given to feed() in as many pieces as wanted, and
+    finished lines are returned as soon as later text can't change them anymore.
+    The last lines are returned by close().
+
+    The lines are instances of the md2gemini.gemtext classes, depending on their
+    kind, so they don't have to be looked at again to know what they are.
+    """
+
+    def __init__(self):
+        # Paragraphs
+        self._in_paragraph = False
+        self._paragraph = []  # Pieces of the paragraph that hasn't ended yet
+        # Text after the last newline, link delimiters can't be handled until it ends
+        self._pending = []
+        self._after_newline = False  # Whether the pending text comes after a newline
+        # Lines waiting to know if they're one of the last ones
+        self._lines = deque()
+        self._pre = False  # Whether we're in a preformatted area or not
+        self._strip_next = False  # Whether the next line comes after a link
+        # Lines that might be at the end of the document, where they get stripped
+        self._started = False
+        self._last = None  # The last line that isn't blank
+        self._blanks = []  # Blank lines after it
+
+    def feed(self, text):
+        """Process more rendered text, and return a list of finished lines."""
+
+        out = []
+        for i, part in enumerate(text.split(PARAGRAPH_DELIM)):
+            if i > 0:
+                # A paragraph delimiter came before this part
+                if self._in_paragraph:
+                    self._add(self._end_paragraph(), out)
+                self._in_paragraph = not self._in_paragraph
+            if self._in_paragraph:
+                self._paragraph.append(part)
+            elif part:
+                # Add in hard linebreaks
+                self._add(part.replace(LINEBREAK, NEWLINE), out)
+        return out
+
+    def close(self, footnotes=""):
+        """Finish the document, and return a list of the remaining lines.
+
+        footnotes: Footnotes rendered at the end of the document.
+        """
+
+        out = []
+        if self._in_paragraph:
+            self._in_paragraph = False
+            self._add(self._end_paragraph(), out)
+        # Add remaining footnotes at end of file
+        if footnotes:
+            self._add(footnotes, out)
+        if self._pending:
+            self._split("".join(self._pending), out)
+            self._pending = []
+
+        lines = list(self._lines)
+        self._lines.clear()
+        if lines and lines[-1] == "":
+            lines.pop()
+        length = len(lines)
+        for i, line in enumerate(lines):
+            self._fix(line, i + 2 < length, out)
+
+        if self._last is not None:
+            out.append(type(self._last)(self._last.rstrip()))
+        return out
+
+    def _end_paragraph(self):
+        # Remove newlines within paragraphs, and add two newlines after them.
+        pg = "".join(self._paragraph).strip()
+        self._paragraph = []
+        pg = pg.replace("\r\n", "\n")  # Make all newlines the same
+        pg = pg.replace(
+            "\n", " "
+        )  # Get rid of newlines in the same paragraph, like markdown does
+        pg += NEWLINE * 2  # Add a blank line between paragraphs
+        return pg.replace(LINEBREAK, NEWLINE)
+
+    def _add(self, text, out):
+        # Only text up to a newline is split, so that link delimiters can
+        # always see the characters on both sides of them.
+        cut = text.rfind("\n") + 1
+        if cut == 0:
+            self._pending.append(text)
+            return
+        if self._pending:
+            self._pending.append(text[:cut])
+            self._split("".join(self._pending), out)
+        else:
+            self._split(text[:cut], out)
+        self._pending = [text[cut:]] if cut < len(text) else []
+
+    def _split(self, text, out):
+        def link_delims(m):
+            start, end = m.span()
+            # Double link delims are produced by multiple footnotes, they count as one
+            count = (end - start + 1) // 2
+            # The link delims that are next to newlines are removed,
+            # so we don't end up with double newlines.
+            if text[start - 1] == "\n" if start > 0 else self._after_newline:
+                count -= 1
+            if text.startswith("\n", end) or text.startswith("\r\n", end):
+                count -= 1
+            return NEWLINE * max(count, 0)
+
+        if LINK_DELIM in text:
+            text = LINK_DELIMS_EXPR.sub(link_delims, text)
+        self._after_newline = True
+
+        for line in text.splitlines():
+            self._lines.append(line)
+            if len(self._lines) > 3:
+                # The line is followed by at least two more that will be kept
+                self._fix(self._lines.popleft(), True, out)
+
+    def _fix(self, line, next_not_last, out):
+        # Remove left whitespace in the lines after links
+        if self._strip_next:
+            line = line.lstrip()
+            self._strip_next = False
+        # Maintain preformatted state
+        if line.startswith("```"):
+            self._pre = not self._pre
+            line = PreformatToggle(line)
+        elif self._pre:
+            line = Preformatted(line)
+        else:
+            if next_not_last and line.startswith("=>"):
+                self._strip_next = True
+            line = parse_line(line)
+
+        # Blank lines at the start and end of the document are removed
+        if not line.strip():
+            if line or self._started:
+                self._started = True
+                self._blanks.append(line)
+            return
+        self._started = True
+        if self._last is not None:
+            out.append(self._last)
+        out.extend(self._blanks)
+        self._blanks = []
+        self._last = line
@@ -3,17 +3,39 @@ All the renderers that convert markdown to gemini.
 """
 
 import re
+import time
+import itertools
 import mistune
-from .unitable import UniTable, ArraySizeError
 
 
 NEWLINE = "\r\n"  # For Windows support
 PARAGRAPH_DELIM = "\x02"  # The marker for paragraph start and end, for post processing
 LINK_DELIM = "\x03"
 LINEBREAK = "\x01"  # Represents a hard linebreak that should not be changed
+# The markers in the markdown itself, which are replaced before converting
+MARKERS_EXPR = re.compile("[" + LINEBREAK + PARAGRAPH_DELIM + LINK_DELIM + "]")
 
 FENCE_EXPR = re.compile(r"^( *)```")
 
+# The renderer methods that are counted and timed when stats are enabled
+STATS_METHODS = [
+    "paragraph",
+    "list",
+    "list_item",
+    "block_quote",
+    "block_code",
+    "table",
+    "table_head",
+    "table_body",
+    "table_row",
+    "table_cell",
+    "link",
+    "image",
+]
+
+# The ways tables can be rendered, see GeminiRenderer
+TABLE_MODES = ["box", "pipe", "tsv", "list"]
+
 
 class GeminiRenderer(
     mistune.HTMLRenderer
@@ -35,7 +57,17 @@ class GeminiRenderer(
         link_func=None,
         table_tag="table",
         checklist=True,
+        stats=False,
+        max_table_rows=None,
+        max_table_cells=None,
+        max_table_width=80,
+        table_mode="box",
     ):
+        """stats: Count the calls and the time spent in the main renderer methods,
+        as well as the footnotes and table cells produced. The results are in the
+        stats dict after each document, see _new_stats for its format.
+        """
+
         # Disable all the HTML renderer's messing around:
         super().__init__(escape=False, allow_harmful_protocols=True)
 
@@ -64,8 +96,29 @@ class GeminiRenderer(
         self.table_tag = table_tag
         self.checklist = checklist
         # Tables
-        self.unitable = None
+        self.box_table = None  # The table being rendered in the box mode
         self.table_cols_align = []  # List of column alignments: ["l", "r", "c"]
+        # When set, table() returns nothing and leaves an iterator of its lines in
+        # table_lines instead, so big tables can be output without building them
+        # as a single string.
+        self.stream_tables = False
+        self.table_lines = None
+        # Limits for big tables
+        self.max_table_rows = max_table_rows
+        self.max_table_cells = max_table_cells
+        if max_table_width is None:
+            max_table_width = 80
+        self.max_table_width = max_table_width
+        self.table_rows_cut = 0  # Rows left out of the current table
+        self.table_row_count = 0  # Rows kept in the current table
+        self.table_columns = 0  # Cells in the header of the current table
+        self.table_footnotes = 0  # Footnotes there were at the end of the last row
+        if table_mode is None:
+            table_mode = "box"
+        if table_mode not in TABLE_MODES:
+            raise ValueError("table_mode must be one of " + ", ".join(TABLE_MODES))
+        self.table_mode = table_mode
+        self.table_header = []  # Header cells, for the list mode
         # Footnote links
         self.links = links
         if self.links in ["paragraph", "at-end", "copy"]:
@@ -79,6 +132,48 @@ class GeminiRenderer(
         self.footnote_texts = (
             []
         )  # ["link text", ...] - used for links "copy" mode, when link text also needs to be stored
+        # Stats
+        self.stats = None
+        if stats:
+            self.stats = self._new_stats()
+            for name in STATS_METHODS:
+                # Only this instance is changed, the methods stay untouched
+                # when stats are disabled.
+                setattr(self, name, self._timed(name, getattr(self, name)))
+
+    def reset(self):
+        """Clear the state kept while rendering, so the renderer can be used
+        for another document."""
+
+        self.box_table = None
+        self.table_cols_align = []
+        self.table_lines = None
+        self.footnote_num = 0
+        self.footnotes = []
+        self.footnote_texts = []
+        if self.stats is not None:
+            self.stats = self._new_stats()
+
+    @staticmethod
+    def _new_stats():
+        stats = {name: {"calls": 0, "seconds": 0.0} for name in STATS_METHODS}
+        stats["footnotes"] = 0  # Number of footnote links rendered
+        stats["table_cells"] = 0  # Number of table cells drawn, headers included
+        return stats
+
+    def _timed(self, name, method):
+        timer = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = timer()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                stat = self.stats[name]
+                stat["calls"] += 1
+                stat["seconds"] += timer() - start
+
+        return timed
 
     def _gem_link(self, link, text=None):
         # Links are handled in post processing, these control characters
@@ -102,6 +197,12 @@ class GeminiRenderer(
             return text
         return text + "[" + str(self.footnote_num) + "]"
 
+    def _remove_footnotes(self, count):
+        # Forget the footnotes added after the first count ones
+        self.footnote_num -= len(self.footnotes) - count
+        del self.footnotes[count:]
+        del self.footnote_texts[count:]
+
     def _render_footnotes(self):
         if not self.footnotes_enabled:
             return ""
@@ -110,6 +211,8 @@ class GeminiRenderer(
 
         ret = ""
         length = len(self.footnotes)
+        if self.stats is not None:
+            self.stats["footnotes"] += length
         if self.links == "copy":
             for i, url in enumerate(self.footnotes):
                 # Calculate the relative footnote number - there could be five footnotes
@@ -417,61 +520,190 @@ class GeminiRenderer(
 
     # Tables
     # Most of the funcs just return the text unchanged because the actual text processing
-    # is done at the end, using the UniTable class.
-
-    def _init_table(self):
-        self.unitable = UniTable()
-        if self.ascii:
-            self.unitable.set_style("default")
-        else:
-            self.unitable.set_style("light")
+    # is done at the end, using the Table class.
 
     def table(self, text):
         # Called at the end I think, once all the table elements
         # have been processed
+        if self.table_mode != "box":
+            return self._table_text(text)
+        if self.stats is not None:
+            rows = len(self.box_table.rows) + 1
+            self.stats["table_cells"] += rows * self.box_table.columns
+        lines = self._table_body(self.box_table, self.table_rows_cut)
+        if self.stream_tables:
+            if self.stats is not None:
+                lines = self._timed_lines(lines)
+            self.table_lines = self._table_lines(lines)
+            return ""
         # Put the table in a preprocessed block
         return (
             "```"
             + self.table_tag
             + NEWLINE
-            + self.unitable.draw()
+            + "\n".join(lines)
             + NEWLINE
             + "```"
             + NEWLINE
         )
 
+    def _table_lines(self, lines):
+        # The same as what table() returns, line by line
+        yield "```" + self.table_tag + NEWLINE
+        for line in lines:
+            yield line + NEWLINE
+        yield "```" + NEWLINE
+
+    def _timed_lines(self, lines):
+        # Streamed tables are drawn after table() returns, as their lines are
+        # taken, so the time spent drawing them is added to its stats here
+        stat = self.stats["table"]
+        timer = time.perf_counter
+        lines = iter(lines)
+        while True:
+            start = timer()
+            line = next(lines, None)
+            stat["seconds"] += timer() - start
+            if line is None:
+                return
+            yield line
+
+    def _table_body(self, table, cut):
+        # Returns an iterator of the table lines. Tables that are too big or too
+        # wide to be drawn are written as pipe-delimited rows instead.
+        cells = (len(table.rows) + 1) * table.columns
+        if (
+            self.max_table_cells is not None and cells > self.max_table_cells
+        ) or not table.fits():
+            lines = self._pipe_table(table)
+        else:
+            lines = table.draw_iter()
+        if cut > 0:
+            lines = itertools.chain(lines, [self._rows_cut_marker(cut)])
+        return lines
+
+    def _pipe_table(self, table):
+        yield self._pipe_row(table.header)
+        yield self._pipe_row(["---"] * table.columns)
+        for row in table.rows:
+            yield self._pipe_row(row)
+
+    @staticmethod
+    def _rows_cut_marker(cut):
+        return "[" + str(cut) + " more row" + ("s]" if cut > 1 else "]")
+
+    @staticmethod
+    def _pipe_row(cells):
+        return "| " + " | ".join(cell.replace("|", "\\|") for cell in cells) + " |"
+
     def table_head(self, text):
-        self._init_table()
+        self.table_rows_cut = 0
+        self.table_row_count = 0
+        self.table_columns = text.count("\n")  # \n ends each cell, see table_cell
+        self.table_footnotes = len(self.footnotes)
+        if self.table_mode != "box":
+            return self._table_row_text(text, True)
+        # Imported here, so the width and wrapping modules are only loaded when
+        # there's a table to draw
+        from .tables import Table
+
         # The table_cell func splits each column using newlines
-        try:
-            self.unitable.header(
-                text.split("\n")[:-1]  # \n is used to delimit cells internally
-            )
-        except ArraySizeError:
-            # raise Exception("Malformed table")
-            pass
-        # Set and clear the alignment data, now that the number of columns should be known
-        self.unitable.set_cols_align(self.table_cols_align)
-        self.unitable.set_cols_valign(["m"] * len(self.table_cols_align))
+        self.box_table = Table(
+            text.split("\n")[:-1],  # \n is used to delimit cells internally
+            self.table_cols_align,
+            style="ascii" if self.ascii else "light",
+            max_width=self.max_table_width,
+        )
+        # Clear the alignment data, now that the number of columns is known
         self.table_cols_align = []
         return text
 
     def table_body(self, text):
+        if self.table_mode != "box":
+            return text
         return ""
 
     def table_row(self, text):
-        try:
-            self.unitable.add_row(
-                # The table_cell func splits each column using newlines
-                text.split("\n")[:-1]  # \n is used to delimit cells internally
-            )
-        except ArraySizeError:
-            # raise Exception("Malformed table")
-            pass
+        footnotes = self.table_footnotes
+        self.table_footnotes = len(self.footnotes)
+        if text.count("\n") != self.table_columns:
+            # Rows with a different number of cells than the header are left out,
+            # along with the footnotes of their links
+            self._remove_footnotes(footnotes)
+            self.table_footnotes = footnotes
+            self.table_cols_align = []
+            return ""
+        if (
+            self.max_table_rows is not None
+            and self.table_row_count >= self.max_table_rows
+        ):
+            # Rows past the limit are only counted, and neither their text nor
+            # the footnotes of their links are kept
+            self._remove_footnotes(footnotes)
+            self.table_footnotes = footnotes
+            self.table_rows_cut += 1
+            self.table_cols_align = []
+            return ""
+        self.table_row_count += 1
+        if self.table_mode != "box":
+            return self._table_row_text(text, False)
+        self.box_table.add_row(
+            # The table_cell func splits each column using newlines
+            text.split("\n")[:-1]  # \n is used to delimit cells internally
+        )
         self.table_cols_align = []
         # The text processing is done in other funcs
         return text
 
+    # The other table modes write each row as it comes, without a Table
+
+    def _table_row_text(self, text, is_head):
+        self.table_cols_align = []
+        cells = text.split("\n")[:-1]  # \n is used to delimit cells internally
+        if self.stats is not None:
+            self.stats["table_cells"] += len(cells)
+        if is_head:
+            self.table_header = cells
+        if self.table_mode == "pipe":
+            if is_head:
+                separator = self._pipe_row(["---"] * len(cells))
+                return self._pipe_row(cells) + "\n" + separator + "\n"
+            return self._pipe_row(cells) + "\n"
+        if self.table_mode == "tsv":
+            return "\t".join(cell.replace("\t", " ") for cell in cells) + "\n"
+        # The list mode uses the header cells as labels, instead of a line
+        if is_head:
+            return ""
+        items = []
+        for label, cell in zip(self.table_header, cells):
+            if cell:
+                items.append(label + ": " + cell if label else cell)
+        if not items:
+            return ""
+        return "* " + ", ".join(items) + "\n"
+
+    def _table_text(self, text):
+        lines = text.split("\n")[:-1]
+        if self.table_rows_cut > 0:
+            lines.append(self._rows_cut_marker(self.table_rows_cut))
+        if self.table_mode == "list":
+            # Rendered like a list, see list()
+            return (
+                PARAGRAPH_DELIM
+                + LINEBREAK.join(lines)
+                + self._end_of_paragraph()
+                + PARAGRAPH_DELIM
+            )
+        return (
+            "```"
+            + self.table_tag
+            + NEWLINE
+            + "\n".join(lines)
+            + NEWLINE
+            + "```"
+            + NEWLINE
+        )
+
     def table_cell(self, text, align=None, is_head=False):
         if align in ["left", "right", "center"]:
             self.table_cols_align.append(align[0])  # l, r, or c
@@ -0,0 +1,255 @@
+"""
+Drawing tables with box characters, for GeminiRenderer.
+"""
+
+import textwrap
+import cjkwrap
+from wcwidth import wcwidth
+
+# The vertical line, then the left corner, horizontal line, crossing and right
+# corner of the top line, the line below the header, the lines between rows and
+# the bottom line.
+STYLES = {
+    "light": ("│", "┌─┬┐", "╞═╪╡", "├─┼┤", "└─┴┘"),
+    "ascii": ("|", "+-++", "+=++", "+-++", "+-++"),
+}
+
+
+class _CharWidths(dict):
+    # The width of each character, looked up once and remembered
+    def __missing__(self, c):
+        width = self[c] = max(0, wcwidth(c))
+        return width
+
+
+_char_widths = _CharWidths()
+
+
+def str_width(text):
+    """Return how many columns the text takes in a terminal."""
+
+    if text.isascii() and text.isprintable():
+        return len(text)
+    return sum(map(_char_widths.__getitem__, text))
+
+
+def cell_width(cell):
+    """Return the width of a cell, with tabs going to the next multiple of 8."""
+
+    if "\t" not in cell:
+        return str_width(cell)
+    width = 0
+    parts = cell.split("\t")
+    for part in parts[:-1]:
+        width = (width + str_width(part)) // 8 * 8 + 8
+    return width + str_width(parts[-1])
+
+
+class _AsciiWrapper(textwrap.TextWrapper):
+    # Words longer than a line are cut where the line ends, like cjkwrap does,
+    # without looking for a hyphen to break at.
+    def _handle_long_word(self, reversed_chunks, cur_line, cur_len, width):
+        space_left = 1 if width < 1 else width - cur_len
+        if self.break_long_words:
+            chunk = reversed_chunks[-1]
+            cur_line.append(chunk[:space_left])
+            reversed_chunks[-1] = chunk[space_left:]
+        elif not cur_line:
+            cur_line.append(reversed_chunks.pop())
+
+
+def wrap(text, width):
+    """Wrap the text to lines of at most width columns.
+
+    ASCII text is wrapped by textwrap, other text by cjkwrap, which knows about
+    wide characters but is much slower.
+    """
+
+    if text.isascii():
+        return _AsciiWrapper(width).wrap(text)
+    return cjkwrap.wrap(text, width)
+
+
+def fill_widths(wanted, available):
+    """Share the available width between columns that want the given widths.
+
+    The narrow columns get all they want, and the others are cut to the same
+    level. What is left below one character per column goes to the first of them.
+    """
+
+    level = 0
+    remaining = available
+    for k, want in enumerate(sorted(wanted)):
+        growing = len(wanted) - k
+        if (want - level) * growing > remaining:
+            break
+        remaining -= (want - level) * growing
+        level = want
+    level += remaining // growing
+    extra = remaining % growing
+    widths = []
+    for want in wanted:
+        if want <= level:
+            widths.append(want)
+        elif extra:
+            widths.append(level + 1)
+            extra -= 1
+        else:
+            widths.append(level)
+    return widths
+
+
+class Table:
+    """A table of text cells, drawn with box characters.
+
+    header: The header cells, which are centered.
+
+    aligns: The alignment of each column, "l", "c" or "r".
+
+    style: "light" for Unicode box characters, or "ascii".
+
+    max_width: The width the table has to fit in, cells are wrapped to fit it.
+    Put 0 for no limit.
+
+    Cells spanning several lines are vertically centered, except in the header.
+    """
+
+    def __init__(self, header, aligns, style="light", max_width=80):
+        self.header = header
+        self.aligns = aligns
+        self.columns = len(header)
+        self.rows = []
+        self.style = STYLES[style]
+        self.max_width = max_width
+        # The width of each cell is measured once, when it's added
+        self._header_widths = [cell_width(cell) for cell in header]
+        self._rows_widths = []
+        # Wrapped cells and the width of their lines, for cells that come up again
+        self._wrapped = {}
+
+    def add_row(self, cells):
+        """Add a row, which must have a cell for each column."""
+
+        if len(cells) != self.columns:
+            raise ValueError(
+                "the row has "
+                + str(len(cells))
+                + " cells instead of "
+                + str(self.columns)
+            )
+        self.rows.append(cells)
+        self._rows_widths.append([cell_width(cell) for cell in cells])
+
+    def fits(self):
+        """Return whether the table can be drawn within max_width. Columns can
+        be narrowed down to a single character, but not less."""
+
+        return not self.max_width or self.max_width >= self.columns * 4 + 1
+
+    def draw(self):
+        """Return the drawn table, without a newline at the end."""
+
+        return "\n".join(self.draw_iter())
+
+    def draw_iter(self):
+        """Yield the lines of the drawn table, without newlines."""
+
+        widths = self._column_widths()
+        _, top, header, between, bottom = self.style
+
+        yield self._rule(top, widths)
+        yield from self._draw_row(
+            self.header, self._header_widths, widths, ["c"] * self.columns, False
+        )
+        yield self._rule(header, widths)
+        between = self._rule(between, widths)  # The same for every row
+        for i, (row, row_widths) in enumerate(zip(self.rows, self._rows_widths)):
+            if i > 0:
+                yield between
+            yield from self._draw_row(row, row_widths, widths, self.aligns, True)
+        yield self._rule(bottom, widths)
+
+    def _column_widths(self):
+        widths = list(self._header_widths)
+        for row_widths in self._rows_widths:
+            widths = list(map(max, widths, row_widths))
+        deco_width = self.columns * 3 + 1
+        if self.max_width and sum(widths) + deco_width > self.max_width:
+            if not self.fits():
+                raise ValueError("max_width is too low to draw the table")
+            widths = fill_widths(widths, self.max_width - deco_width)
+        return widths
+
+    @staticmethod
+    def _rule(chars, widths):
+        left, line, cross, right = chars
+        return (
+            left
+            + line
+            + (line + cross + line).join(line * width for width in widths)
+            + line
+            + right
+        )
+
+    def _draw_row(self, cells, cell_widths, widths, aligns, middle):
+        vertical = self.style[0]
+        separator = " " + vertical + " "
+
+        # Most rows fit on one line, and are drawn directly
+        parts = []
+        for cell, cell_width, width, align in zip(cells, cell_widths, widths, aligns):
+            if not self._unwrapped(cell, cell_width, width):
+                break
+            parts.append(self._align(cell, width - cell_width, align))
+        else:
+            return [vertical + " " + separator.join(parts) + " " + vertical]
+
+        wrapped = []
+        for cell, cell_width, width in zip(cells, cell_widths, widths):
+            if self._unwrapped(cell, cell_width, width):
+                wrapped.append(([cell], [cell_width]))
+            elif cell.strip() == "":
+                wrapped.append(([""], [0]))
+            else:
+                wrapped.append(self._wrap(cell, width))
+        height = max(len(lines) for lines, _ in wrapped)
+
+        out = []
+        for i in range(height):
+            parts = []
+            for (lines, line_widths), width, align in zip(wrapped, widths, aligns):
+                # The lines of cells shorter than the row are centered vertically
+                # with middle, and at the top otherwise
+                j = i - (height - len(lines)) // 2 if middle else i
+                if 0 <= j < len(lines):
+                    parts.append(self._align(lines[j], width - line_widths[j], align))
+                else:
+                    parts.append(" " * width)
+            out.append(vertical + " " + separator.join(parts) + " " + vertical)
+        return out
+
+    @staticmethod
+    def _unwrapped(cell, cell_width, width):
+        # Whether wrapping would leave the cell as it is
+        return (
+            cell_width <= width
+            and cell.isascii()
+            and cell.isprintable()
+            and cell[:1] != " "
+            and cell[-1:] != " "
+        )
+
+    def _wrap(self, cell, width):
+        key = (cell, width)
+        if key not in self._wrapped:
+            lines = wrap(cell, width)
+            self._wrapped[key] = (lines, [str_width(line) for line in lines])
+        return self._wrapped[key]
+
+    @staticmethod
+    def _align(line, fill, align):
+        if align == "r":
+            return " " * fill + line
+        if align == "c":
+            return " " * (fill // 2) + line + " " * (fill - fill // 2)
+        return line + " " * fill
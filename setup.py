@@ -28,5 +28,9 @@ setuptools.setup(
         "cjkwrap",
         "wcwidth",
     ],
+    extras_require={
+        # To parse front matter, see split_frontmatter
+        "frontmatter": ["pyyaml", "tomli; python_version < '3.11'"],
+    },
     entry_points={"console_scripts": ["md2gemini = md2gemini:main"]},
 )
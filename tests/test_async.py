@@ -0,0 +1,98 @@
+import asyncio
+import threading
+import pytest
+from md2gemini import md2gemini, md2gemini_async, AsyncConverter
+
+MD = "Some [link](https://example.com) in a paragraph.\n\n| a | b |\n|---|---|\n| 1 | 2 |"
+
+
+def test_md2gemini_async():
+    gem = asyncio.run(md2gemini_async(MD, links="paragraph"))
+    assert gem == md2gemini(MD, links="paragraph")
+
+
+class Blocker:
+    """A link_func that blocks until released, and tracks how many run at once."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.lock = threading.Lock()
+        self.running = 0
+        self.most = 0
+
+    def __call__(self, link):
+        with self.lock:
+            self.running += 1
+            self.most = max(self.most, self.running)
+        self.release.wait(5)
+        with self.lock:
+            self.running -= 1
+        return link
+
+
+def test_concurrency_limit():
+    blocker = Blocker()
+
+    async def main():
+        async with AsyncConverter(
+            max_workers=4, max_concurrency=2, link_func=blocker
+        ) as converter:
+            tasks = [asyncio.ensure_future(converter.convert(MD)) for _ in range(6)]
+            await asyncio.sleep(0.1)
+            blocker.release.set()
+            return await asyncio.gather(*tasks)
+
+    results = asyncio.run(main())
+    assert blocker.most == 2
+    assert results == [md2gemini(MD)] * 6
+
+
+def test_queue_full():
+    blocker = Blocker()
+
+    async def main():
+        converter = AsyncConverter(max_concurrency=1, max_queue=1, link_func=blocker)
+        running = asyncio.ensure_future(converter.convert(MD))
+        waiting = asyncio.ensure_future(converter.convert(MD))
+        await asyncio.sleep(0.05)
+        with pytest.raises(asyncio.QueueFull):
+            await converter.convert(MD)
+        blocker.release.set()
+        await asyncio.gather(running, waiting)
+        converter.close()
+
+    asyncio.run(main())
+
+
+def test_cancel_waiting():
+    blocker = Blocker()
+
+    async def main():
+        converter = AsyncConverter(max_concurrency=1, link_func=blocker)
+        running = asyncio.ensure_future(converter.convert(MD))
+        waiting = asyncio.ensure_future(converter.convert(MD))
+        await asyncio.sleep(0.05)
+        waiting.cancel()
+        await asyncio.sleep(0)
+        assert len(converter._waiters) == 0
+        blocker.release.set()
+        await running
+        # The slot is free again for later conversions
+        assert await converter.convert(MD) == md2gemini(MD)
+        assert converter._running == 0
+        converter.close()
+
+    asyncio.run(main())
+
+
+def test_process_executor():
+    async def main():
+        async with AsyncConverter("process", max_workers=1, links="at-end") as conv:
+            return await conv.convert(MD)
+
+    assert asyncio.run(main()) == md2gemini(MD, links="at-end")
+
+
+def test_invalid_executor():
+    with pytest.raises(ValueError):
+        AsyncConverter("threads")
@@ -0,0 +1,212 @@
+import os
+import sys
+import time
+from md2gemini import main, md2gemini
+
+
+def run(monkeypatch, *argv):
+    """Run the command line program, and return its exit code."""
+
+    monkeypatch.setattr(sys, "argv", ["md2gemini", *argv])
+    try:
+        main()
+    except SystemExit as e:
+        return e.code
+    return 0
+
+
+def make_files(tmp_path, count):
+    files = []
+    for i in range(count):
+        path = tmp_path / ("doc" + str(i) + ".md")
+        # Different sizes, so the largest-first order differs from the given one
+        path.write_text(
+            "# Doc " + str(i) + "\n\n" + "Some [text](/t).\n\n" * (i * 7 % 5)
+        )
+        files.append(str(path))
+    return files
+
+
+def test_jobs_output_order(tmp_path, monkeypatch, capsys):
+    files = make_files(tmp_path, 6)
+    assert run(monkeypatch, "--jobs", "3", *files) == 0
+    expected = "".join(md2gemini(open(f).read()) + "\n" for f in files)
+    assert capsys.readouterr().out == expected
+
+
+def test_jobs_same_file_twice(tmp_path, monkeypatch, capsys):
+    files = make_files(tmp_path, 2)
+    argv = [files[0], files[1], files[0]]
+    assert run(monkeypatch, *argv) == 0
+    sequential = capsys.readouterr().out
+    assert run(monkeypatch, "-J", "2", *argv) == 0
+    assert capsys.readouterr().out == sequential
+    assert sequential.count("# Doc 0") == 2
+
+
+def test_jobs_write(tmp_path, monkeypatch):
+    files = make_files(tmp_path, 4)
+    out = tmp_path / "out"
+    out.mkdir()
+    assert run(monkeypatch, "-J", "2", "-w", "-d", str(out), *files) == 0
+    for i, f in enumerate(files):
+        with open(out / ("doc" + str(i) + ".gmi"), newline="") as gmi:
+            assert gmi.read() == md2gemini(open(f).read())
+
+
+def test_jobs_missing_file(tmp_path, monkeypatch, capsys):
+    files = make_files(tmp_path, 2)
+    missing = str(tmp_path / "missing.md")
+    assert run(monkeypatch, "-J", "2", files[0], missing, files[1]) == 1
+    captured = capsys.readouterr()
+    assert "File " + missing + " cannot be found." in captured.err
+    # The other files are still converted
+    assert captured.out.count("# Doc") == 2
+
+
+def test_invalid_jobs(monkeypatch, capsys):
+    assert run(monkeypatch, "--jobs", "-1", "a.md") == 1
+
+
+def make_tree(tmp_path):
+    src = tmp_path / "src"
+    for path in ["index.md", "a/index.md", "a/b/page.md", "a/notes.txt", "drafts/x.md"]:
+        (src / path).parent.mkdir(parents=True, exist_ok=True)
+        (src / path).write_text("# " + path + "\n")
+    out = tmp_path / "out"
+    out.mkdir()
+    return src, out
+
+
+def written(out):
+    return sorted(p.relative_to(out).as_posix() for p in out.rglob("*.gmi"))
+
+
+def test_recursive_write(tmp_path, monkeypatch):
+    src, out = make_tree(tmp_path)
+    assert run(monkeypatch, "-w", "-r", str(src), "-d", str(out)) == 0
+    assert written(out) == ["a/b/page.gmi", "a/index.gmi", "drafts/x.gmi", "index.gmi"]
+    assert (out / "a/b/page.gmi").read_text() == "# a/b/page.md"
+
+
+def test_recursive_globs(tmp_path, monkeypatch):
+    src, out = make_tree(tmp_path)
+    args = ["-w", "-r", str(src), "-d", str(out), "--exclude", "drafts"]
+    assert run(monkeypatch, *args, "--include", "*.md", "--include", "*.txt") == 0
+    assert written(out) == ["a/b/page.gmi", "a/index.gmi", "a/notes.gmi", "index.gmi"]
+
+
+def test_recursive_globs_path(tmp_path, monkeypatch):
+    src, out = make_tree(tmp_path)
+    assert (
+        run(monkeypatch, "-w", "-r", str(src), "-d", str(out), "--exclude", "a/b/*")
+        == 0
+    )
+    assert written(out) == ["a/index.gmi", "drafts/x.gmi", "index.gmi"]
+
+
+def test_recursive_jobs(tmp_path, monkeypatch):
+    src, out = make_tree(tmp_path)
+    assert run(monkeypatch, "-J", "2", "-w", "-r", str(src), "-d", str(out)) == 0
+    assert written(out) == ["a/b/page.gmi", "a/index.gmi", "drafts/x.gmi", "index.gmi"]
+
+
+def test_directory_without_recursive(tmp_path, monkeypatch, capsys):
+    src, out = make_tree(tmp_path)
+    assert run(monkeypatch, str(src)) == 1
+    assert "cannot be found" in capsys.readouterr().err
+
+
+def test_incremental(tmp_path, monkeypatch):
+    src, out = make_tree(tmp_path)
+    args = ["-w", "-r", str(src), "-d", str(out), "--incremental"]
+    assert run(monkeypatch, *args) == 0
+    assert (out / ".md2gemini-manifest.json").exists()
+
+    # Mark the outputs, to see which ones get written again
+    for gmi in out.rglob("*.gmi"):
+        gmi.write_text("stale")
+    (src / "a/index.md").write_text("# changed\n")
+    # Touched, but with the same content
+    os.utime(src / "index.md", ns=(0, 0))
+    (out / "drafts/x.gmi").unlink()
+
+    assert run(monkeypatch, *args) == 0
+    assert (out / "a/index.gmi").read_text() == "# changed"
+    assert (out / "drafts/x.gmi").read_text() == "# drafts/x.md"
+    assert (out / "index.gmi").read_text() == "stale"
+    assert (out / "a/b/page.gmi").read_text() == "stale"
+
+    # Different options rebuild everything
+    assert run(monkeypatch, *args, "--plain") == 0
+    assert "stale" not in [p.read_text() for p in out.rglob("*.gmi")]
+
+
+def test_incremental_jobs(tmp_path, monkeypatch):
+    src, out = make_tree(tmp_path)
+    args = ["-J", "2", "-w", "-r", str(src), "-d", str(out), "--incremental"]
+    assert run(monkeypatch, *args) == 0
+    (out / "index.gmi").write_text("stale")
+    (src / "a/index.md").write_text("# changed\n")
+    assert run(monkeypatch, *args) == 0
+    assert (out / "index.gmi").read_text() == "stale"
+    assert (out / "a/index.gmi").read_text() == "# changed"
+
+
+def test_incremental_needs_write(monkeypatch):
+    assert run(monkeypatch, "--incremental", "a.md") == 1
+
+
+def test_watch(tmp_path, monkeypatch, capsys):
+    src, out = make_tree(tmp_path)
+    page = src / "a/b/page.md"
+    # Each fake sleep is one polling interval
+    steps = [
+        lambda: page.write_text("# first save\n"),
+        lambda: page.write_text("# second save, right after\n"),
+        lambda: None,  # No more changes, so the file is converted
+        lambda: None,
+    ]
+
+    def sleep(seconds):
+        if not steps:
+            raise KeyboardInterrupt
+        steps.pop(0)()
+
+    monkeypatch.setattr(time, "sleep", sleep)
+    assert run(monkeypatch, "-w", "-r", str(src), "-d", str(out), "--watch") == 0
+    assert (out / "a/b/page.gmi").read_text() == "# second save, right after"
+    assert capsys.readouterr().err.count("Converted") == 1
+
+
+def test_watch_needs_files(monkeypatch):
+    assert run(monkeypatch, "--watch") == 1
+
+
+def test_profile(tmp_path, monkeypatch, capsys):
+    files = make_files(tmp_path, 2)
+    profile = tmp_path / "profile"
+    assert run(monkeypatch, "--profile", str(profile), *files) == 0
+    captured = capsys.readouterr()
+    assert captured.out.count("# Doc") == 2
+    assert "Profiles written to" in captured.err
+    for i in range(2):
+        assert (profile / ("doc" + str(i) + ".pstats")).exists()
+        assert "tottime" in (profile / ("doc" + str(i) + ".txt")).read_text()
+        collapsed = (profile / ("doc" + str(i) + ".collapsed")).read_text()
+        # Every line is a stack of frames and a count of microseconds
+        for line in collapsed.splitlines():
+            stack, count = line.rsplit(" ", 1)
+            assert int(count) > 0
+        assert "__init__.py:convert" in collapsed
+
+
+def test_profile_needs_one_job(tmp_path, monkeypatch):
+    assert run(monkeypatch, "--profile", str(tmp_path), "-J", "2", "a.md") == 1
+
+
+def test_table_mode(tmp_path, monkeypatch, capsys):
+    path = tmp_path / "table.md"
+    path.write_text("a|b\n-|-\n1|2\n")
+    assert run(monkeypatch, "--table-mode", "tsv", str(path)) == 0
+    assert capsys.readouterr().out == "```table\r\na\tb\r\n1\t2\r\n```\n"
@@ -0,0 +1,55 @@
+import pytest
+from .util import normalize
+from md2gemini import md2gemini, Converter
+
+
+def test_converter_reuse():
+    md = "A [link](https://example.com) here.\n\na|b\n-|-\n1|2\n"
+    gem = """
+A link[1] here.
+
+=> https://example.com 1: https://example.com
+
+```table
+┌───┬───┐
+│ a │ b │
+╞═══╪═══╡
+│ 1 │ 2 │
+└───┴───┘
+```
+""".strip()
+
+    converter = Converter(links="paragraph")
+    # Footnote numbers and tables must not carry over between documents
+    assert normalize(converter.convert(md)) == gem
+    assert normalize(converter.convert(md)) == gem
+
+
+def test_converter_at_end_reset():
+    converter = Converter(links="at-end")
+    first = converter.convert("[a](/a) and [b](/b)")
+    second = converter.convert("[c](/c)")
+    assert normalize(second) == "c[1]\n\n=> /c 1: /c"
+    assert first == md2gemini("[a](/a) and [b](/b)", links="at-end")
+
+
+def test_converter_frontmatter():
+    converter = Converter(frontmatter=True)
+    assert converter.convert("---\nsome text\n---\nbeginning") == "beginning"
+    assert converter.convert("") == ""
+
+
+def test_converter_invalid_link_func():
+    with pytest.raises(TypeError):
+        Converter(link_func="not callable")
+
+
+def test_md2gemini_reentrant():
+    # link_func calling md2gemini with the same options must not share state
+    def link_func(link):
+        if link != "/x":
+            md2gemini("[x](/x)", links="paragraph", link_func=link_func)
+        return link
+
+    gem = md2gemini("[a](/a) [b](/b)", links="paragraph", link_func=link_func)
+    assert normalize(gem) == "a[1] b[2]\n\n=> /a 1: /a\n=> /b 2: /b"
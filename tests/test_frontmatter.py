@@ -1,5 +1,8 @@
+import datetime
+import sys
+import pytest
 from .util import normalize
-from md2gemini import md2gemini
+from md2gemini import md2gemini, split_frontmatter, Converter
 
 
 def f(md):
@@ -29,3 +32,67 @@ def test_no_remove_frontmatter_zola():
     md = "+++\nsome text"
     gem = "+++ some text"
     assert f(md) == gem
+
+
+def test_remove_frontmatter_crlf():
+    md = "\r\n---\r\ntitle: x\r\n---\r\nbeginning\r\n\r\nend"
+    assert f(md) == "beginning\n\nend"
+
+
+def test_only_frontmatter():
+    assert f("---\ntitle: x\n---\n") == ""
+
+
+def test_jekyll_keeps_zola_frontmatter():
+    md = "+++\nsome text\n+++\nbeginning"
+    assert normalize(md2gemini(md, jekyll=True)) == "+++ some text +++ beginning"
+
+
+def test_frontmatter_option_values():
+    # Any true value turns the option on, like before
+    md = "+++\nsome text\n+++\nbody"
+    assert f(md) == md2gemini(md, frontmatter="yes") == "body"
+    md = "---\nsome text\n---\nbody"
+    assert md2gemini(md, jekyll=True, frontmatter=None) == "body"
+    assert md2gemini(md, jekyll=1, frontmatter=0) == "body"
+
+
+def test_split_frontmatter():
+    assert split_frontmatter("---\ntitle: x\n---\nbody\n") == ("title: x", "body\n")
+    assert split_frontmatter("+++\n+++\nbody") == ("", "body")
+    assert split_frontmatter("---\nno end") == (None, "---\nno end")
+    assert split_frontmatter("body") == (None, "body")
+
+
+def test_split_frontmatter_parse():
+    pytest.importorskip("yaml")
+    md = "---\ntitle: x\ntags: [a, b]\n---\nbody"
+    assert split_frontmatter(md, parse=True) == (
+        {"title": "x", "tags": ["a", "b"]},
+        "body",
+    )
+    assert split_frontmatter("---\n---\nbody", parse=True) == ({}, "body")
+
+
+def test_split_frontmatter_parse_toml():
+    if sys.version_info < (3, 11):
+        pytest.importorskip("tomli")
+    md = '+++\ntitle = "x"\ndate = 2020-01-02\n+++\nbody'
+    assert split_frontmatter(md, parse=True) == (
+        {"title": "x", "date": datetime.date(2020, 1, 2)},
+        "body",
+    )
+
+
+def test_converter_metadata():
+    pytest.importorskip("yaml")
+    converter = Converter(frontmatter=True)
+    assert converter.metadata is None
+    assert converter.convert("---\ntitle: x\n---\nbody") == "body"
+    assert converter.metadata == {"title": "x"}
+    converter.convert("body")
+    assert converter.metadata is None
+    # Nothing is removed without the option
+    converter = Converter()
+    converter.convert("---\ntitle: x\n---\nbody")
+    assert converter.metadata is None
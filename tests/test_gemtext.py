@@ -0,0 +1,66 @@
+from md2gemini import md2gemini_iter
+from md2gemini.gemtext import (
+    Text,
+    Link,
+    Heading,
+    ListItem,
+    Quote,
+    PreformatToggle,
+    Preformatted,
+)
+
+MD = """
+# Title
+
+Text with a [link](/one) in it.
+
+* item
+* item
+
+> quote
+
+```python
+=> not a link
+* not an item
+```
+"""
+
+
+def test_line_kinds():
+    lines = list(md2gemini_iter(MD))
+    assert [(type(line), line) for line in lines] == [
+        (Heading, "# Title"),
+        (Text, ""),
+        (Text, "Text with a "),
+        (Link, "=> /one link"),
+        (Text, "in it."),
+        (Text, ""),
+        (ListItem, "* item"),
+        (ListItem, "* item"),
+        (Text, ""),
+        (Quote, "> quote"),
+        (Text, ""),
+        (PreformatToggle, "```python"),
+        (Preformatted, "=> not a link"),
+        (Preformatted, "* not an item"),
+        (PreformatToggle, "```"),
+    ]
+
+
+def test_line_parts():
+    link = Link("=> gemini://example.com/ Some text")
+    assert link.url == "gemini://example.com/"
+    assert link.text == "Some text"
+    assert Link("=>/a").url == "/a"
+    assert Link("=>/a").text == ""
+    assert Heading("### Title").level == 3
+    assert Heading("### Title").text == "Title"
+    assert ListItem("* item").text == "item"
+    assert Quote("> quote").text == "quote"
+    assert PreformatToggle("```table").alt == "table"
+
+
+def test_markers_in_markdown():
+    # The control characters the renderer uses internally are replaced
+    lines = list(md2gemini_iter("one\x02two\x01three\x03four"))
+    assert lines == ["one\ufffdtwo\ufffdthree\ufffdfour"]
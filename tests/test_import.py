@@ -0,0 +1,57 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Generous, so slow machines pass, but well below what importing asyncio and
+# the command line modules with it would cost
+BUDGET = 0.5  # Seconds
+
+
+def import_times(code):
+    """Run code in a new interpreter, and return the cumulative import time of
+    each imported module, in seconds."""
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+def test_import_lazy():
+    times = import_times("import md2gemini")
+    for name in (
+        "asyncio",
+        "argparse",
+        "concurrent.futures",
+        "json",
+        "cProfile",
+        "md2gemini.cli",
+        "md2gemini.aio",
+        "md2gemini.tables",
+        "cjkwrap",
+        "wcwidth",
+    ):
+        assert name not in times
+    assert times["md2gemini"] < BUDGET
+
+
+def test_import_on_use():
+    times = import_times(
+        "from md2gemini import md2gemini, AsyncConverter\n"
+        "md2gemini('| a |\\n| - |\\n| b |')"
+    )
+    assert "md2gemini.aio" in times
+    assert "md2gemini.tables" in times
+    assert "argparse" not in times
@@ -0,0 +1,68 @@
+from md2gemini import md2gemini, md2gemini_iter, Converter
+
+MD = """---
+title: x
+---
+First [a](/a) and [b](/b).
+
+* item
+
+Last.
+"""
+
+
+def record(**kwargs):
+    phases = []
+    gem = md2gemini(
+        MD, instrument=lambda *phase: phases.append(phase), frontmatter=True, **kwargs
+    )
+    return (
+        gem,
+        {phase[0]: phase[1:] for phase in phases},
+        [phase[0] for phase in phases],
+    )
+
+
+def test_instrument_phases():
+    gem, phases, order = record(links="at-end")
+    assert order == ["frontmatter", "parse", "render", "footnotes", "postprocess"]
+    assert all(seconds >= 0 for seconds, _, _ in phases.values())
+
+    _, md_size, body_size = phases["frontmatter"]
+    assert md_size == len(MD)
+    assert body_size < md_size
+    assert phases["parse"][1] == body_size
+    assert phases["parse"][2] == phases["render"][1] == 3  # Top-level blocks
+    assert phases["footnotes"][1] == 2
+    assert phases["postprocess"][1] == phases["render"][2] + phases["footnotes"][2]
+    assert phases["postprocess"][2] == len(gem)
+
+
+def test_instrument_same_output():
+    gem, phases, _ = record(links="paragraph")
+    assert gem == md2gemini(MD, frontmatter=True, links="paragraph")
+    assert phases["footnotes"][1:] == (0, 0)
+
+
+def test_instrument_iter():
+    phases = []
+    lines = list(md2gemini_iter(MD, instrument=lambda *phase: phases.append(phase)))
+    assert lines == md2gemini(MD).split("\r\n")
+    assert len(phases) == 5
+
+
+def test_instrument_converter():
+    phases = []
+    Converter().convert(MD, instrument=lambda *phase: phases.append(phase))
+    assert phases[-1][0] == "postprocess"
+
+
+def test_instrument_render_time():
+    # Inline markup is parsed and rendered in the render phase, which takes
+    # much longer than splitting the document into blocks
+    md = "".join("Paragraph *" + str(i) + "* with [a](/x).\n\n" for i in range(2000))
+    phases = {}
+    md2gemini(
+        md, instrument=lambda name, seconds, *sizes: phases.update({name: seconds})
+    )
+    assert phases["render"] > phases["parse"]
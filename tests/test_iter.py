@@ -0,0 +1,62 @@
+import io
+import pytest
+from md2gemini import md2gemini, md2gemini_iter, NEWLINE
+
+MD = """
+# Title
+
+First [paragraph](/one) with a link.
+
+* item with [link](/two)
+* item
+
+Last paragraph.
+"""
+
+
+@pytest.mark.parametrize("links", ["newline", "paragraph", "at-end", "copy", "off"])
+def test_iter_same_output(links):
+    lines = list(md2gemini_iter(MD, links=links))
+    assert NEWLINE.join(lines) == md2gemini(MD, links=links)
+
+
+def test_iter_file():
+    assert list(md2gemini_iter(io.StringIO(MD))) == md2gemini(MD).split(NEWLINE)
+
+
+def test_iter_at_end_footnotes():
+    lines = list(md2gemini_iter(MD, links="at-end"))
+    assert lines[-2:] == ["=> /one 1: /one", "=> /two 2: /two"]
+
+
+def test_iter_is_lazy():
+    seen = []
+
+    def link_func(link):
+        seen.append(link)
+        return link
+
+    lines = md2gemini_iter(MD, links="paragraph", link_func=link_func)
+    assert next(lines) == "# Title"
+    # Only the blocks needed for the first line have been rendered
+    assert "/two" not in seen
+    list(lines)
+    assert seen == ["/one", "/two"]
+
+
+def test_iter_empty():
+    assert list(md2gemini_iter("")) == []
+
+
+def test_iter_table_lines():
+    md = "a|b\n-|-\n" + "".join(str(i) + "|[x](/x)\n" for i in range(50)) + "\nAfter."
+    lines = md2gemini_iter(md, links="paragraph", ascii_table=True)
+    assert next(lines) == "```table"
+    assert next(lines) == "+----+-------+"
+    rest = list(lines)
+    assert ["```table", "+----+-------+"] + rest == md2gemini(
+        md, links="paragraph", ascii_table=True
+    ).split(NEWLINE)
+    # Tables in other blocks are still drawn whole
+    quoted = "> " + md.replace("\n", "\n> ")
+    assert NEWLINE.join(md2gemini_iter(quoted)) == md2gemini(quoted)
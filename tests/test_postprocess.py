@@ -0,0 +1,58 @@
+from md2gemini.postprocess import PostProcessor
+from md2gemini.renderers import NEWLINE, PARAGRAPH_DELIM, LINK_DELIM, LINEBREAK
+
+
+def process(pieces, footnotes=""):
+    post = PostProcessor()
+    lines = []
+    for piece in pieces:
+        lines.extend(post.feed(piece))
+    lines.extend(post.close(footnotes))
+    return NEWLINE.join(lines)
+
+
+RENDERED = (
+    PARAGRAPH_DELIM
+    + "before\n"
+    + LINK_DELIM
+    + "=> /foo bar"
+    + LINK_DELIM
+    + "  after"
+    + PARAGRAPH_DELIM
+    + "```\r\n=> not a link\r\n  code\r\n```\r\n\r\n"
+    + PARAGRAPH_DELIM
+    + "one"
+    + LINEBREAK
+    + "two"
+    + PARAGRAPH_DELIM
+)
+GEM = "before \r\n=> /foo bar\r\nafter\r\n\r\n```\r\n=> not a link\r\n  code\r\n```\r\n\r\none\r\ntwo"
+
+
+def test_postprocess():
+    assert process([RENDERED]) == GEM
+
+
+def test_postprocess_pieces():
+    # Splitting the rendered text anywhere must not change the output
+    for i in range(len(RENDERED)):
+        assert process([RENDERED[:i], RENDERED[i:]]) == GEM
+    assert process(list(RENDERED)) == GEM
+
+
+def test_postprocess_footnotes():
+    footnotes = (
+        LINK_DELIM
+        + "=> /a 1: /a"
+        + LINK_DELIM
+        + LINK_DELIM
+        + "=> /b 2: /b"
+        + LINK_DELIM
+    )
+    gem = process([PARAGRAPH_DELIM + "a[1] b[2]" + PARAGRAPH_DELIM], footnotes)
+    assert gem == "a[1] b[2]\r\n\r\n=> /a 1: /a\r\n=> /b 2: /b"
+
+
+def test_postprocess_blank():
+    assert process([]) == ""
+    assert process(["\r\n  \r\n", PARAGRAPH_DELIM + PARAGRAPH_DELIM]) == ""
@@ -0,0 +1,64 @@
+from md2gemini import Converter, md2gemini
+from md2gemini.renderers import GeminiRenderer
+
+MD = """
+Some [link](/a) and ![image](/i.png).
+
+* one [b](/b)
+  * nested
+
+> quote
+
+```
+code
+```
+
+a|b|c
+-|-|-
+1|2|3
+4|5|6
+"""
+
+
+def test_stats():
+    converter = Converter(links="paragraph", stats=True)
+    gem = converter.convert(MD)
+    assert gem == md2gemini(MD, links="paragraph")
+
+    stats = converter.stats
+    assert stats["paragraph"]["calls"] == 2  # The quote has a paragraph too
+    assert stats["link"]["calls"] == 2
+    assert stats["image"]["calls"] == 1
+    assert stats["list"]["calls"] == 2
+    assert stats["list_item"]["calls"] == 2
+    assert stats["block_quote"]["calls"] == 1
+    assert stats["block_code"]["calls"] == 1
+    assert stats["table"]["calls"] == 1
+    assert stats["table_row"]["calls"] == 2
+    assert stats["table_cell"]["calls"] == 9
+    assert stats["table_cells"] == 9
+    assert stats["footnotes"] == 2
+    assert all(stats[name]["seconds"] >= 0 for name in ["paragraph", "table"])
+
+
+def test_stats_table_drawing():
+    # Tables are drawn while they're output, which must still count for table
+    row = "word " * 30 + "|" + "other " * 20 + "\n"
+    converter = Converter(stats=True)
+    converter.convert("a|b\n-|-\n" + row * 300)
+    stats = converter.stats
+    assert stats["table"]["seconds"] > stats["table_row"]["seconds"]
+
+
+def test_stats_reset():
+    converter = Converter(stats=True)
+    converter.convert(MD)
+    converter.convert("Just text.")
+    assert converter.stats["paragraph"]["calls"] == 1
+    assert converter.stats["table_cells"] == 0
+
+
+def test_stats_disabled():
+    assert Converter().stats is None
+    # The methods aren't wrapped when stats are disabled
+    assert "paragraph" not in vars(GeminiRenderer())
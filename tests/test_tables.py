@@ -0,0 +1,196 @@
+import pytest
+from wcwidth import wcwidth
+import cjkwrap
+from md2gemini import tables
+from md2gemini.tables import Table, str_width, cell_width, fill_widths, wrap
+from md2gemini import md2gemini, md2gemini_iter, NEWLINE, GeminiRenderer
+
+
+def test_str_width():
+    for text in ["", "plain ascii", "日本語", "café", "é", "\x01x\x7f"]:
+        assert str_width(text) == sum(max(0, wcwidth(c)) for c in text)
+    assert str_width("日本語 text") == 11
+
+
+def test_cell_width():
+    assert cell_width("ab\tc") == 9
+    assert cell_width("\t日本\tx") == 17
+
+
+def round_robin(wanted, available):
+    # How widths were handed out by texttable, one character at a time
+    widths = [0] * len(wanted)
+    i = 0
+    while available > 0:
+        if widths[i] < wanted[i]:
+            widths[i] += 1
+            available -= 1
+        i = (i + 1) % len(wanted)
+    return widths
+
+
+def test_fill_widths():
+    for wanted in [[10], [3, 20, 5], [0, 7, 7, 2], [30, 30, 1, 30], [4, 9, 16, 25]]:
+        for available in range(sum(wanted)):
+            assert fill_widths(wanted, available) == round_robin(wanted, available)
+
+
+def test_wrapped_table():
+    table = Table(["name", "description"], ["l", "r"], style="ascii", max_width=30)
+    table.add_row(["short", "a rather long description that has to wrap"])
+    table.add_row(["日本語", "x"])
+    assert table.draw().split("\n") == [
+        "+--------+-------------------+",
+        "|  name  |    description    |",
+        "+========+===================+",
+        "|        |     a rather long |",
+        "| short  |  description that |",
+        "|        |       has to wrap |",
+        "+--------+-------------------+",
+        "| 日本語 |                 x |",
+        "+--------+-------------------+",
+    ]
+
+
+def test_draw_iter():
+    table = Table(["a", "b"], ["l", "c"], max_width=20)
+    table.add_row(["1", "two"])
+    table.add_row(["3", "a cell too long for the width"])
+    assert list(table.draw_iter()) == table.draw().split("\n")
+    assert table.draw().split("\n")[:3] == [
+        "┌───┬──────────────┐",
+        "│ a │      b       │",
+        "╞═══╪══════════════╡",
+    ]
+
+
+def test_table_row_size():
+    table = Table(["a", "b"], ["l", "l"])
+    with pytest.raises(ValueError):
+        table.add_row(["1", "2", "3"])
+    assert Table(["a"] * 20, ["l"] * 20).fits() is False
+    assert Table(["a"] * 20, ["l"] * 20, max_width=0).fits() is True
+
+
+def test_wrap():
+    for text in ["a very-long-hyphenated-word here", "tabs\tand  spaces ", "x" * 30]:
+        for width in [1, 4, 7, 12]:
+            assert wrap(text, width) == cjkwrap.wrap(text, width)
+    assert wrap("日本語のテキスト", 6) == ["日本語", "のテキ", "スト"]
+
+
+def test_wrap_once_per_table(monkeypatch):
+    calls = []
+
+    def counting_wrap(text, width):
+        calls.append(text)
+        return wrap(text, width)
+
+    monkeypatch.setattr(tables, "wrap", counting_wrap)
+    table = Table(["a", "b"], ["l", "l"], max_width=20)
+    for i in range(5):
+        table.add_row([str(i), "the same text, long enough to wrap"])
+    table.draw()
+    assert calls == ["the same text, long enough to wrap"]
+
+
+def test_numbers_as_written():
+    md = "a|b|c\n-|-|-\n1e9|3.14159|42.0\n"
+    gem = md2gemini(md, ascii_table=True)
+    assert "| 1e9 | 3.14159 | 42.0 |" in gem.split(NEWLINE)
+
+
+BIG = "a|b\n-|-\n" + "".join(str(i) + "|x\n" for i in range(6))
+
+
+def test_max_table_rows():
+    lines = md2gemini(BIG, max_table_rows=2, ascii_table=True).split(NEWLINE)
+    assert lines[-3:] == ["+---+---+", "[4 more rows]", "```"]
+    assert "| 1 | x |" in lines and "| 2 | x |" not in lines
+
+
+@pytest.mark.parametrize("mode", ["box", "pipe", "tsv", "list"])
+def test_cut_rows_not_kept(mode):
+    renderer = GeminiRenderer(max_table_rows=1, table_mode=mode)
+    renderer.table_head("a\nb\n")
+    renderer.table_row("1\nx\n")
+    # The text of cut rows isn't joined into the table body
+    assert renderer.table_row("2\nx\n") == ""
+    assert renderer.table_rows_cut == 1
+
+
+@pytest.mark.parametrize("mode", ["box", "pipe", "tsv", "list"])
+def test_cut_rows_footnotes(mode):
+    md = "a|b\n-|-\n" + "".join(
+        str(i) + "|[x](https://" + str(i) + ".com)\n" for i in range(4)
+    )
+    gem = md2gemini(
+        md + "\nEnd [y](/y).", max_table_rows=1, table_mode=mode, links="at-end"
+    )
+    # Only the links of the rows that are shown get footnotes
+    assert gem.endswith("=> https://0.com 1: https://0.com" + NEWLINE + "=> /y 2: /y")
+    assert "https://1.com" not in gem
+
+
+@pytest.mark.parametrize("mode", ["box", "pipe", "tsv", "list"])
+def test_mismatched_rows(mode):
+    # The second row has three cells, it's left out with its footnote
+    md = "| a | b |\n|-|-|\n| 1 | [x](/x) |\n| a|b | [y](/y) |\n| 2 | [z](/z) |"
+    gem = md2gemini(md, table_mode=mode, links="at-end")
+    assert "y" not in gem
+    assert gem.endswith("=> /x 1: /x" + NEWLINE + "=> /z 2: /z")
+
+
+def test_max_table_cells():
+    gem = md2gemini(BIG, max_table_cells=10)
+    assert gem.split(NEWLINE) == ["```table", "| a | b |", "| --- | --- |"] + [
+        "| " + str(i) + " | x |" for i in range(6)
+    ] + ["```"]
+    assert md2gemini(BIG, max_table_cells=14) == md2gemini(BIG)
+
+
+def test_max_table_width():
+    wide = "|".join("c" * 20) + "\n" + "|".join("-" * 20) + "\n"
+    # 20 columns can't fit in 80 characters
+    assert md2gemini(wide).split(NEWLINE)[1] == "| " + " | ".join("c" * 20) + " |"
+    assert md2gemini(wide, max_table_width=0).split(NEWLINE)[1].startswith("┌─")
+
+
+def test_limits_streamed():
+    for options in [{"max_table_rows": 3}, {"max_table_cells": 4}]:
+        gem = NEWLINE.join(md2gemini_iter(BIG + "\nText", **options))
+        assert gem == md2gemini(BIG + "\nText", **options)
+
+
+MODES_MD = "n|a|b\n-|:-:|-\n1|x|y\\|z\n2||t\n\nAfter."
+
+
+@pytest.mark.parametrize(
+    "mode,lines",
+    [
+        (
+            "pipe",
+            [
+                "| n | a | b |",
+                "| --- | --- | --- |",
+                "| 1 | x | y\\|z |",
+                "| 2 |  | t |",
+            ],
+        ),
+        ("tsv", ["n\ta\tb", "1\tx\ty|z", "2\t\tt"]),
+    ],
+)
+def test_table_mode_block(mode, lines):
+    gem = md2gemini(MODES_MD, table_mode=mode)
+    assert gem.split(NEWLINE) == ["```table"] + lines + ["```", "After."]
+    assert NEWLINE.join(md2gemini_iter(MODES_MD, table_mode=mode)) == gem
+
+
+def test_table_mode_list():
+    gem = md2gemini(MODES_MD, table_mode="list", max_table_rows=1)
+    assert gem.split(NEWLINE) == ["* n: 1, a: x, b: y|z", "[1 more row]", "", "After."]
+
+
+def test_table_mode_invalid():
+    with pytest.raises(ValueError):
+        md2gemini(MODES_MD, table_mode="html")